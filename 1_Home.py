@@ -1,6 +1,9 @@
 import streamlit as st
-from src.data_manager import load_users, load_listings, init_data, save_user, verify_password, save_password, reset_password
-from src.ai_matcher import ai_assistant
+from src.data_manager import load_users, load_listings, init_data, save_user, verify_password, save_password, reset_password, get_user_by_email, email_exists
+from src import config
+from src.ai_matcher import ai_assistant, ai_assistant_stream
+from src.instrumentation import begin_rerun, end_rerun
+from src.ui_components import debug_panel
 import os
 init_data()  # Initialize data files if they don't exist
 import json
@@ -8,6 +11,8 @@ from streamlit_lottie import st_lottie
 import urllib.parse
 import html
 
+begin_rerun("Home")  # Profiling no-op unless UNISYNC_PROFILE=1
+
 st.set_page_config(  # Configure page settings
     page_title="Uni-Sync - Connect & Collaborate",
     page_icon="🤝",
@@ -41,8 +46,6 @@ if 'ai_chat_history' not in st.session_state:
     st.session_state.ai_chat_history = []
 if 'user_query_key' not in st.session_state:
     st.session_state.user_query_key = 0
-if 'api_key_index' not in st.session_state:
-    st.session_state.api_key_index = 0
 if 'show_reset_form' not in st.session_state:
     st.session_state.show_reset_form = False
 
@@ -94,19 +97,13 @@ with st.sidebar:
             
             if st.form_submit_button("🚀 Login", type="primary", use_container_width=True):
                 if verify_password(login_email, login_password):
-                    current_user = next((u for u in users if u.get('email', '').lower() == login_email.lower()), None)
+                    current_user = get_user_by_email(login_email)
                     if current_user:
                         st.session_state.current_user = current_user
                         
-                        from src.data_manager import get_user_connections
-                        connections = get_user_connections(current_user.get('id'))
-                        
-                        st.session_state.matches = []  # Load existing connections
-                        for conn in connections:
-                            other_user_id = conn['user2_id'] if conn['user1_id'] == current_user.get('id') else conn['user1_id']
-                            other_user = next((u for u in users if u.get('id') == other_user_id), None)
-                            if other_user and conn.get('connection_type') == 'peer_match':
-                                st.session_state.matches.append(other_user)
+                        from src.data_manager import get_user_neighbors, get_users_by_ids
+                        peer_ids = [peer_id for peer_id, _, _ in get_user_neighbors(current_user.get('id'), 'peer_match')]
+                        st.session_state.matches = get_users_by_ids(peer_ids)  # Load existing connections
                         
                         st.success(f"Welcome back, {current_user.get('name')}!")
                         st.rerun()
@@ -223,8 +220,7 @@ with st.sidebar:
                 elif x_factor_type == "Yes, I can teach" and (not new_x_factor or not new_can_teach):
                     st.error("⚠️ Please enter your X-Factor and teaching skills")
                 else:
-                    existing_emails = [u.get('email', '').lower() for u in users]
-                    if new_email.lower() in existing_emails:
+                    if email_exists(new_email):
                         st.error("⚠️ Email already registered!")
                     else:
                         new_user = {
@@ -399,9 +395,23 @@ if submit_button and user_query and user_query.strip():
         })
     else:
         st.session_state.ai_chat_history.append({"role": "user", "content": user_query})
-        with st.spinner("🤖 Uni-Sync AI is thinking..."):
-            ai_response = ai_assistant(user_query, users, listings)
-            st.session_state.ai_chat_history.append({"role": "assistant", "content": ai_response})
+        if config.AI_STREAM:  # Render chunks as they arrive; the chat history below then shows the final answer
+            answer_placeholder = st.empty()
+            answer_placeholder.markdown('<div class="chat-assistant"><b>🤖 AI Assistant:</b> Uni-Sync AI is thinking...</div>',
+                                        unsafe_allow_html=True)
+            ai_response = ""
+            for chunk in ai_assistant_stream(user_query, user=st.session_state.current_user):
+                ai_response += chunk
+                answer_placeholder.markdown(f'''
+                <div class="chat-assistant">
+                    <b>🤖 AI Assistant:</b> {ai_response}
+                </div>
+                ''', unsafe_allow_html=True)
+            answer_placeholder.empty()
+        else:
+            with st.spinner("🤖 Uni-Sync AI is thinking..."):
+                ai_response = ai_assistant(user_query, user=st.session_state.current_user)  # Cached per query and data version
+        st.session_state.ai_chat_history.append({"role": "assistant", "content": ai_response})
 
 if st.session_state.ai_chat_history:  # Display chat history
     st.markdown("---")
@@ -520,4 +530,7 @@ st.markdown('''
 <footer>
     <p>Made with ❤️ for the university community | <strong>Uni-Sync</strong> © 2024</p>
 </footer>
-''', unsafe_allow_html=True)
\ No newline at end of file
+''', unsafe_allow_html=True)
+
+debug_panel()
+end_rerun()
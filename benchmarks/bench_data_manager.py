@@ -0,0 +1,212 @@
+"""Benchmark every public src.data_manager operation on generated datasets.
+
+    python benchmarks/bench_data_manager.py --sizes 1000 10000 --backend csv --out bench.json
+
+Each size gets a fresh dataset from src.datagen in a temporary folder. Every
+operation is timed warm (shared caches kept) and cold (caches dropped before
+each call); results are written as JSON so runs can be diffed over time.
+
+With several sizes the report also gives the warm p50 growth of the writes
+that should not depend on table size (save_connection, save_rating on the
+SQLite backend or append-only CSV); --max-write-growth turns it into a check:
+
+    python benchmarks/bench_data_manager.py --sizes 1000 20000 --backend sqlite \
+        --ops save_connection save_rating --max-write-growth 2
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add parent directory to path
+
+from src import data_manager as dm
+from src.datagen import generate
+from src.storage import CSVStorage, SQLiteStorage, set_storage
+
+
+def _written_bytes():  # Bytes handed to write() by this process (Linux), None elsewhere
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+
+
+def _operations(size, rng):  # name -> callable taking the iteration number
+    user_ids = lambda: rng.randint(1, size)
+    emails = [u.get('email') for u in dm.load_users()]
+    return {
+        "load_users": lambda i: dm.load_users(),
+        "load_listings": lambda i: dm.load_listings(),
+        "load_passwords": lambda i: dm.load_passwords(),
+        "verify_password": lambda i: dm.verify_password(rng.choice(emails), "password123"),
+        "get_user_by_email": lambda i: dm.get_user_by_email(rng.choice(emails)),
+        "email_exists": lambda i: dm.email_exists(f"nobody{i}@campus.edu"),
+        "get_users_by_ids": lambda i: dm.get_users_by_ids([user_ids() for _ in range(10)]),
+        "get_user_connections": lambda i: dm.get_user_connections(user_ids()),
+        "get_user_neighbors": lambda i: dm.get_user_neighbors(user_ids(), 'peer_match'),
+        "get_user_rating": lambda i: dm.get_user_rating(user_ids()),
+        "get_ratings_for": lambda i: dm.get_ratings_for([user_ids() for _ in range(20)]),
+        "get_rating_distribution": lambda i: dm.get_rating_distribution(user_ids()),
+        "get_user_reviews": lambda i: dm.get_user_reviews(user_ids()),
+        "load_reviews_grouped": lambda i: dm.load_reviews_grouped(),
+        "query_users": lambda i: dm.query_users(filters={'year': '2nd Year'}, sort_key='name', limit=20),
+        "query_listings": lambda i: dm.query_listings(filters={'type': 'furniture'}, limit=12),
+        "query_reviews": lambda i: dm.query_reviews(limit=20),
+        "compatibility_row": lambda i: dm.get_compatibility_index().scores_from(dm.get_user_directory().by_id(user_ids())),
+        "save_user": lambda i: dm.save_user({"name": f"Bench User {i}", "email": f"bench{i}@campus.edu",
+                                             "year": "1st Year", "major": "Physics", "skills": "Python",
+                                             "interests": "Music", "x_factor": "", "can_teach": "Python",
+                                             "wants_to_learn": "Guitar", "accommodation_need": "None"}),
+        "save_password": lambda i: dm.save_password(f"bench{i}@campus.edu", "password123"),
+        "reset_password": lambda i: dm.reset_password(rng.choice(emails), "password456"),
+        "save_connection": lambda i: dm.save_connection(user_ids(), user_ids(), 'peer_match'),
+        "save_listing": lambda i: dm.save_listing({"user_id": user_ids(), "type": "furniture", "title": "Chair",
+                                                   "description": "Bench listing", "location": "Hostel",
+                                                   "price": "₹500", "status": "available"}),
+        "save_rating": lambda i: dm.save_rating(user_ids(), user_ids(), rng.randint(1, 5), "Bench review"),
+    }
+
+
+FLAT_WRITES = ("save_connection", "save_rating")  # Append one row and patch the live indexes
+
+
+def _warm_indexes():  # Build the indexes a warm write patches, as any page visit would
+    dm.get_user_directory()
+    dm.get_user_rating(1)
+    dm.get_user_neighbors(1)
+
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _measure(op, iterations, cold):
+    timings = []
+    track_io = _written_bytes() is not None
+    written = 0
+    allocated = 0
+    peak = 0
+    for i in range(iterations):
+        if cold:
+            dm.invalidate_cache()
+        before_bytes = _written_bytes() if track_io else 0
+        start = time.perf_counter()
+        op(i)
+        timings.append((time.perf_counter() - start) * 1000)
+        if track_io:
+            written += _written_bytes() - before_bytes
+
+    for i in range(iterations, iterations + max(1, iterations // 5)):  # Separate pass: tracemalloc skews timings
+        if cold:
+            dm.invalidate_cache()
+        tracemalloc.start()
+        op(i)
+        current, op_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        allocated += current
+        peak = max(peak, op_peak)
+    alloc_calls = max(1, iterations // 5)
+
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "p50_ms": round(_percentile(timings, 50), 4),
+        "p90_ms": round(_percentile(timings, 90), 4),
+        "p99_ms": round(_percentile(timings, 99), 4),
+        "mean_ms": round(sum(timings) / len(timings), 4),
+        "max_ms": round(timings[-1], 4),
+        "retained_bytes_per_call": allocated // alloc_calls,
+        "peak_alloc_bytes": peak,
+        "bytes_written_per_call": written // iterations if track_io else None,
+    }
+
+
+def run(sizes, backend, iterations, seed, ops=None, append_only=False):
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix=f"unisync-bench-{size}-") as data_dir:
+            generate(data_dir, users=size, seed=seed)
+            if backend == "sqlite":
+                storage = SQLiteStorage(os.path.join(data_dir, "unisync.db"), data_dir)
+            else:
+                storage = CSVStorage(data_dir, append_only=append_only)
+            previous = set_storage(storage)
+            try:
+                dm.init_data()
+                dm.invalidate_cache()
+                rng = random.Random(seed)
+                for name, op in _operations(size, rng).items():
+                    if ops and name not in ops:
+                        continue
+                    for cold in (False, True):
+                        if not cold:
+                            _warm_indexes()
+                        stats = _measure(op, iterations, cold)
+                        results.append(dict(size=size, op=name, mode="cold" if cold else "warm", **stats))
+                        print(f"{size:>7} {name:<24} {'cold' if cold else 'warm'}  "
+                              f"p50={stats['p50_ms']:.3f}ms p99={stats['p99_ms']:.3f}ms", file=sys.stderr)
+            finally:
+                set_storage(previous)
+                dm.invalidate_cache()
+    return results
+
+
+def write_growth(results):  # op -> warm p50 at the largest size / at the smallest, for FLAT_WRITES
+    p50 = {(r["size"], r["op"]): r["p50_ms"] for r in results if r["mode"] == "warm"}
+    sizes = sorted({r["size"] for r in results})
+    return {op: round(p50[(sizes[-1], op)] / p50[(sizes[0], op)], 2) for op in FLAT_WRITES
+            if (sizes[0], op) in p50 and (sizes[-1], op) in p50 and p50[(sizes[0], op)] > 0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark src.data_manager at increasing dataset sizes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    parser.add_argument("--append-only", action="store_true", help="CSV backend in append-only log mode")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--ops", nargs="*", help="only run these operations")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    parser.add_argument("--max-write-growth", type=float,
+                        help="exit 1 if a FLAT_WRITES p50 grows more than this factor from the smallest to the largest size")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "append_only": args.append_only,
+            "iterations": args.iterations,
+            "seed": args.seed,
+            "sizes": args.sizes,
+        },
+        "results": run(args.sizes, args.backend, args.iterations, args.seed, args.ops, args.append_only),
+    }
+    report["write_growth"] = write_growth(report["results"])
+    for op, growth in report["write_growth"].items():
+        print(f"{op:<24} warm p50 x{growth} from {min(args.sizes)} to {max(args.sizes)} users", file=sys.stderr)
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    if args.max_write_growth and any(g > args.max_write_growth for g in report["write_growth"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Local stand-in for the Gemini REST API, for load-testing src/ai_matcher.py without spending quota.
+
+    python benchmarks/fake_gemini.py --port 8765 --latency lognormal:800 --rpm-per-key 15 --error-rate 0.02
+    UNISYNC_AI_ENDPOINT=http://127.0.0.1:8765 streamlit run 1_Home.py
+
+Implements models/*:generateContent and models/*:streamGenerateContent. Answers
+are templated from the students listed in the prompt. Latency follows the
+chosen distribution, and per-key quotas and random failures come back as
+429 RESOURCE_EXHAUSTED. GET /stats returns request counters as JSON and
+POST /reset clears them.
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_STUDENT = re.compile(r"^• (?P<name>[^|\n]+)\|Maj:(?P<major>[^|]*)\|.*?(?:T:(?P<teach>[^|]*)\|.*?)?E:(?P<email>[^|\s]+)",
+                      re.MULTILINE)
+_QUERY = re.compile(r'Student query: "(?P<query>.*)"')
+
+
+def parse_latency(spec):  # "fixed:500", "uniform:200-1500", "lognormal:800" (median ms) -> callable returning seconds
+    kind, _, value = spec.partition(":")
+    if kind == "fixed":
+        return lambda: float(value) / 1000
+    if kind == "uniform":
+        low, high = (float(v) for v in value.split("-"))
+        return lambda: random.uniform(low, high) / 1000
+    if kind == "lognormal":
+        median = float(value)
+        return lambda: random.lognormvariate(0, 0.5) * median / 1000
+    raise argparse.ArgumentTypeError(f"unknown latency distribution: {spec}")
+
+
+def template_answer(prompt):  # A plausible "Perfect Matches Found" answer built from the prompt's candidates
+    query = _QUERY.search(prompt)
+    students = list(_STUDENT.finditer(prompt))[:3]
+    lines = ["🎯 Perfect Matches Found!", ""]
+    for match in students:
+        lines += [f"👤 {match['name']} ({match['major']}) - Can teach {match['teach'] or 'study with you'}",
+                  f"   📧 Contact: {match['email']}",
+                  f"   💡 Why: Good fit for \"{query['query'] if query else 'your question'}\"", ""]
+    if not students:
+        lines += ["No close matches on campus yet.", ""]
+    lines.append("📍 Next Steps: Send a short email introducing yourself and suggest a time to meet.")
+    return "\n".join(lines)
+
+
+class FakeGemini:  # Shared state: per-key request windows and counters
+    def __init__(self, latency, rpm_per_key=0, error_rate=0.0, chunks=6, chunk_delay=0.05, retry_delay=2):
+        self.latency = latency
+        self.rpm_per_key = rpm_per_key
+        self.error_rate = error_rate
+        self.chunks = chunks
+        self.chunk_delay = chunk_delay
+        self.retry_delay = retry_delay
+        self._lock = threading.Lock()
+        self._windows = defaultdict(deque)  # api key -> request times in the last minute
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._windows.clear()
+            self.counts = defaultdict(lambda: {"requests": 0, "ok": 0, "rate_limited": 0, "streamed": 0})
+            self.in_flight = 0
+            self.max_in_flight = 0
+
+    def admit(self, key):  # False when this key is over its simulated quota (or a random 429 is due)
+        now = time.monotonic()
+        with self._lock:
+            counts = self.counts[key]
+            counts["requests"] += 1
+            window = self._windows[key]
+            while window and now - window[0] > 60:
+                window.popleft()
+            if (self.rpm_per_key and len(window) >= self.rpm_per_key) or random.random() < self.error_rate:
+                counts["rate_limited"] += 1
+                return False
+            window.append(now)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            return True
+
+    def done(self, key, streamed):
+        with self._lock:
+            self.in_flight -= 1
+            self.counts[key]["ok"] += 1
+            self.counts[key]["streamed"] += streamed
+
+    def stats(self):
+        with self._lock:
+            totals = {name: sum(c[name] for c in self.counts.values())
+                      for name in ("requests", "ok", "rate_limited", "streamed")}
+            keys = {key[-6:]: dict(c) for key, c in self.counts.items()}  # Key suffix only
+            return dict(totals, in_flight=self.in_flight, max_in_flight=self.max_in_flight, keys=keys)
+
+
+def _response(text, final=True):
+    body = {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}]}
+    if final:
+        body["candidates"][0]["finishReason"] = "STOP"
+        body["usageMetadata"] = {"candidatesTokenCount": max(1, len(text) // 4)}
+    return body
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "FakeGemini/1.0"
+    fake = None  # FakeGemini, set by main()
+
+    def log_message(self, format, *args):  # Quiet by default; hundreds of sessions would flood the terminal
+        pass
+
+    def _json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/stats":
+            self._json(200, self.fake.stats())
+        else:
+            self._json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path == "/reset":
+            self.fake.reset()
+            self._json(200, {"ok": True})
+            return
+        stream = url.path.endswith(":streamGenerateContent")
+        if not (stream or url.path.endswith(":generateContent")):
+            self._json(404, {"error": {"code": 404, "message": f"Unknown method {url.path}", "status": "NOT_FOUND"}})
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        key = self.headers.get("x-goog-api-key") or parse_qs(url.query).get("key", [""])[0]
+        if not self.fake.admit(key):
+            self._json(429, {"error": {
+                "code": 429, "status": "RESOURCE_EXHAUSTED",
+                "message": f"Resource has been exhausted (e.g. check quota). Please retry in {self.fake.retry_delay}s.",
+            }})
+            return
+        try:
+            prompt = "".join(part.get("text", "") for content in request.get("contents", [])
+                             for part in content.get("parts", []))
+            answer = template_answer(prompt)
+            time.sleep(self.fake.latency())
+            if stream:
+                self._stream(answer)
+            else:
+                self._json(200, _response(answer))
+        finally:
+            self.fake.done(key, stream)
+
+    def _stream(self, answer):  # JSON array written element by element, like the real REST endpoint
+        size = max(1, -(-len(answer) // self.fake.chunks))
+        pieces = [answer[i:i + size] for i in range(0, len(answer), size)]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()  # No Content-Length: the body ends when the connection closes
+        self.wfile.write(b"[")
+        for i, piece in enumerate(pieces):
+            if i:
+                self.wfile.write(b",\r\n")
+                time.sleep(self.fake.chunk_delay)
+            self.wfile.write(json.dumps(_response(piece, final=i == len(pieces) - 1)).encode())
+            self.wfile.flush()
+        self.wfile.write(b"]")
+
+
+def serve(host="127.0.0.1", port=8765, **options):  # Start in a background thread; returns (server, FakeGemini)
+    fake = FakeGemini(**options)
+    handler = type("BoundHandler", (Handler,), {"fake": fake})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, fake
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake Gemini generateContent server for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=parse_latency, default="lognormal:800",
+                        help="fixed:MS, uniform:LOW-HIGH or lognormal:MEDIAN (time to first byte)")
+    parser.add_argument("--rpm-per-key", type=int, default=0, help="simulated per-key quota, 0 = unlimited")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a random 429")
+    parser.add_argument("--chunks", type=int, default=6, help="chunks per streamed answer")
+    parser.add_argument("--chunk-delay-ms", type=float, default=50)
+    parser.add_argument("--retry-delay", type=int, default=2, help="seconds suggested in 429 messages")
+    args = parser.parse_args(argv)
+
+    server, _ = serve(args.host, args.port, latency=args.latency, rpm_per_key=args.rpm_per_key,
+                      error_rate=args.error_rate, chunks=args.chunks, chunk_delay=args.chunk_delay_ms / 1000,
+                      retry_delay=args.retry_delay)
+    print(f"Fake Gemini listening on http://{args.host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Drive src.ai_matcher with many concurrent simulated sessions against benchmarks/fake_gemini.py.
+
+    python benchmarks/load_ai.py --sessions 200 --questions 5 --keys 5 --rpm-per-key 60 --latency lognormal:800
+
+Starts the fake server in-process (or uses --endpoint to reach one that is
+already running), generates a synthetic campus, and has every session ask
+questions drawn from a small pool so that some of them repeat. Reports
+latency percentiles, answer sources, response cache hit rate, retries and
+429s seen by the server, how many questions shared an in-flight call, and the key pool's per-key state, as JSON.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import Request, urlopen
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add parent directory to path
+
+QUESTIONS = [
+    "Who can teach me Python?", "who can teach python", "Find someone to study calculus with",
+    "I need a study buddy for machine learning", "Looking for a cheap study desk", "Any rooms near campus?",
+    "Can anyone help me with guitar chords?", "Who wants to learn web development with me?",
+    "I want to get better at public speaking before placements, who could mentor me?",
+    "Selling my scientific calculator, who might need one?", "Need help with statistics for my data analysis project",
+    "Who can teach UI/UX design?", "Looking for a hostel roommate", "Find me a Figma design tutor",
+]
+
+
+def _percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))]
+
+
+def _server_call(endpoint, path, method="GET"):
+    with urlopen(Request(endpoint.rstrip("/") + path, method=method, data=b"" if method == "POST" else None)) as r:
+        return json.loads(r.read())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the AI assistant path against a fake Gemini server")
+    parser.add_argument("--sessions", type=int, default=100, help="concurrent simulated Streamlit sessions")
+    parser.add_argument("--questions", type=int, default=5, help="questions asked by each session")
+    parser.add_argument("--think-ms", type=float, default=500, help="mean pause between a session's questions")
+    parser.add_argument("--users", type=int, default=2000, help="synthetic campus size")
+    parser.add_argument("--keys", type=int, default=5, help="fake API keys in the pool")
+    parser.add_argument("--endpoint", help="use an already running fake server instead of starting one")
+    parser.add_argument("--latency", default="lognormal:800", help="in-process server latency (see fake_gemini.py)")
+    parser.add_argument("--rpm-per-key", type=int, default=60, help="quota the fake server enforces per key")
+    parser.add_argument("--pool-rpm", type=int, help="UNISYNC_AI_KEY_RPM for the client-side key pool")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--stream", action="store_true", help="use ai_assistant_stream and time the first chunk")
+    parser.add_argument("--fast-path", action="store_true", help="let the offline matcher answer simple questions")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="unisync-load-")
+    os.environ["UNISYNC_DATA_DIR"] = workdir  # Must be set before src.config is imported
+    os.environ["UNISYNC_AI_CACHE_PATH"] = os.path.join(workdir, "ai_cache.db")
+    os.environ["UNISYNC_AI_FAST_PATH"] = "1" if args.fast_path else "0"
+    if args.pool_rpm:
+        os.environ["UNISYNC_AI_KEY_RPM"] = str(args.pool_rpm)
+    for i in range(1, args.keys + 1):
+        os.environ[f"GEMINI_API_KEY_{i}"] = f"fake-key-{i:02d}"
+
+    if args.endpoint:
+        endpoint = args.endpoint
+    else:
+        from benchmarks.fake_gemini import parse_latency, serve
+        server, _ = serve(port=0, latency=parse_latency(args.latency), rpm_per_key=args.rpm_per_key,
+                          error_rate=args.error_rate)
+        endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ["UNISYNC_AI_ENDPOINT"] = endpoint
+    _server_call(endpoint, "/reset", "POST")
+
+    from src.datagen import generate
+    generate(workdir, users=args.users, seed=args.seed)
+    from src import ai_matcher
+    from src.ai_cache import get_response_cache
+    from src.data_manager import init_data, load_users
+    init_data()
+    users = load_users()
+    ai_matcher.build_prompt("warm up")  # Build the retrieval indexes before the clock starts
+
+    latencies, first_chunk, sources = [], [], {}
+    lock = threading.Lock()
+
+    def session(number):
+        rng = random.Random(args.seed + number)
+        user = rng.choice(users)
+        for _ in range(args.questions):
+            time.sleep(rng.expovariate(1000 / args.think_ms) if args.think_ms else 0)
+            question = rng.choice(QUESTIONS)
+            start = time.perf_counter()
+            first = None
+            if args.stream:
+                answer = ""
+                for chunk in ai_matcher.ai_assistant_stream(question, user=user):
+                    first = first or time.perf_counter() - start
+                    answer += chunk
+            else:
+                answer = ai_matcher.ai_assistant(question, user=user)
+            elapsed = time.perf_counter() - start
+            if answer.startswith("⚠️"):
+                source = "error"
+            elif "ℹ️ Offline matches" in answer:
+                source = "fallback"
+            else:
+                source = "answer"
+            with lock:
+                latencies.append(elapsed * 1000)
+                if first is not None:
+                    first_chunk.append(first * 1000)
+                sources[source] = sources.get(source, 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        list(pool.map(session, range(args.sessions)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    first_chunk.sort()
+    cache = get_response_cache()
+    server_stats = _server_call(endpoint, "/stats")
+    report = {
+        "config": vars(args),
+        "wall_s": round(wall, 2),
+        "questions": len(latencies),
+        "throughput_qps": round(len(latencies) / wall, 2),
+        "latency_ms": {f"p{p}": round(_percentile(latencies, p), 1) for p in (50, 90, 95, 99)},
+        "sources": sources,
+        "cache": {"hits": cache.hits, "misses": cache.misses,
+                  "hit_rate": round(cache.hits / max(1, cache.hits + cache.misses), 3)},
+        "coalesced": dict(ai_matcher.FLIGHT_STATS),
+        "gemini_calls": server_stats["requests"],
+        "server_429s": server_stats["rate_limited"],
+        "server_max_in_flight": server_stats["max_in_flight"],
+        "key_pool": ai_matcher.get_key_pool().stats(),
+    }
+    if first_chunk:
+        report["first_chunk_ms"] = {f"p{p}": round(_percentile(first_chunk, p), 1) for p in (50, 90, 99)}
+    shutil.rmtree(workdir, ignore_errors=True)
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,21 @@ import html
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add parent directory to path
 
-from src.data_manager import load_users
-from src.utils import calculate_compatibility
+from src.data_manager import load_users, query_users, recommend_peers
+from src.ui_components import page_cursor, pager, debug_panel, stop_page
+from src.instrumentation import begin_rerun, end_rerun
 import pandas as pd
 
+MARKETPLACE_USERS_PER_PAGE = 10
+RECOMMENDED_PEERS = 20  # Best teach/learn matches shown at the front of the deck
+
+begin_rerun("Find Peers")  # Profiling no-op unless UNISYNC_PROFILE=1
+
 st.set_page_config(page_title="Find Peers", page_icon="👥", layout="wide")  # Configure page
 
 if 'current_user' not in st.session_state or st.session_state.current_user is None:  # Check authentication
     st.warning("🔒 Please login from the Home page to access Find Peers")
-    st.stop()
+    stop_page()
 
 try:
     with open("assets/style-peer.css") as f:
@@ -117,11 +123,17 @@ def filter_users(users, major_filter, year_filter, skills_filter, interests_filt
 
 filtered_users = filter_users(users, selected_major, selected_year, selected_skills, selected_interests, search_query)  # Get filtered results
 
+match_scores = {}
 if selected_major != "All" or selected_year != "All" or selected_skills or selected_interests or search_query:  # Determine which users to show
     available_users = [u for u in filtered_users if u.get('id') != st.session_state.current_user.get('id') and u.get('id') not in st.session_state.viewed_users]
 else:
     current_user_id = st.session_state.current_user.get('id')
-    available_users = [u for u in users if u.get('id') != current_user_id and u.get('id') not in st.session_state.viewed_users]
+    recommended = recommend_peers(st.session_state.current_user, RECOMMENDED_PEERS, st.session_state.viewed_users)
+    match_scores = {u.get('id'): score for u, score in recommended}
+    available_users = [u for u, _ in recommended] + [  # Best matches first, then everyone else in the usual order
+        u for u in users
+        if u.get('id') != current_user_id and u.get('id') not in st.session_state.viewed_users and u.get('id') not in match_scores
+    ]
 
 if not available_users:
     st.info("🎉 You've seen all available users! Check your matches below or adjust your filters.")
@@ -165,6 +177,7 @@ else:
                 <p><strong>Year:</strong> {html.escape(user.get('year', 'N/A'))}</p>
                 <p><strong>Skills:</strong> {html.escape(user.get('skills', 'N/A'))}</p>
                 <p><strong>Interests:</strong> {html.escape(user.get('interests', 'N/A'))}</p>
+                {f"<p><strong>Match:</strong> {match_scores[user.get('id')]}% teach/learn fit</p>" if user.get('id') in match_scores else ""}
             </div>
             <div class="x-factor">
                 ✨ {html.escape(x_factor_clean)}
@@ -175,8 +188,7 @@ else:
         col_left, col_right = st.columns(2)  # Swipe action buttons
         with col_left:
             if st.button("👎 Pass", use_container_width=True, key=f"pass_{user.get('id')}"):
-                st.session_state.viewed_users.append(user.get('id'))
-                st.session_state.current_user_index += 1
+                st.session_state.viewed_users.append(user.get('id'))  # Drops out of the deck, the next card takes its index
                 st.rerun()
 
         with col_right:
@@ -194,8 +206,7 @@ else:
                 )
                 
                 st.session_state.matches.append(user)
-                st.session_state.viewed_users.append(user.get('id'))
-                st.session_state.current_user_index += 1
+                st.session_state.viewed_users.append(user.get('id'))  # Drops out of the deck, the next card takes its index
                 st.success(f"✅ Connected with {user.get('name')}!")
                 st.rerun()
 
@@ -224,20 +235,33 @@ with col_teach:
     st.markdown('<div class="skill-card teach">', unsafe_allow_html=True)
     st.markdown("### 📚 Skills Available to Learn")
     
-    for user in users:
-        if user.get('can_teach'):
-            skills = user.get('can_teach', '').split(',')
-            for skill in skills:
-                st.write(f"• **{skill.strip()}** - {user.get('name')} ({user.get('email')})")
+    teachers, next_teachers_cursor = query_users(
+        where=lambda u: u.get('can_teach'),
+        limit=MARKETPLACE_USERS_PER_PAGE,
+        cursor=page_cursor("marketplace_teach", None)
+    )
+    for user in teachers:
+        skills = user.get('can_teach', '').split(',')
+        for skill in skills:
+            st.write(f"• **{skill.strip()}** - {user.get('name')} ({user.get('email')})")
+    pager("marketplace_teach", next_teachers_cursor)
     st.markdown('</div>', unsafe_allow_html=True)
 
 with col_learn:
     st.markdown('<div class="skill-card learn">', unsafe_allow_html=True)
     st.markdown("### 🎯 Skills People Want to Learn")
     
-    for user in users:
-        if user.get('wants_to_learn'):
-            skills = user.get('wants_to_learn', '').split(',')
-            for skill in skills:
-                st.write(f"• **{skill.strip()}** - {user.get('name')}")
+    learners, next_learners_cursor = query_users(
+        where=lambda u: u.get('wants_to_learn'),
+        limit=MARKETPLACE_USERS_PER_PAGE,
+        cursor=page_cursor("marketplace_learn", None)
+    )
+    for user in learners:
+        skills = user.get('wants_to_learn', '').split(',')
+        for skill in skills:
+            st.write(f"• **{skill.strip()}** - {user.get('name')}")
+    pager("marketplace_learn", next_learners_cursor)
     st.markdown('</div>', unsafe_allow_html=True)
+
+debug_panel()
+end_rerun()
@@ -8,6 +8,10 @@ import urllib.parse
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add parent directory to path
 
 from src.data_manager import load_users
+from src.instrumentation import begin_rerun, end_rerun
+from src.ui_components import debug_panel, stop_page
+
+begin_rerun("Skill Swap")  # Profiling no-op unless UNISYNC_PROFILE=1
 
 st.set_page_config(  # Configure page settings
     page_title="Skill Swap - Uni-Sync",
@@ -53,7 +57,7 @@ if 'current_user' not in st.session_state or st.session_state.current_user is No
         <p style="color: #a1a1aa !important;">Please login from the Home page to access Skill Swap</p>
     </div>
     """, unsafe_allow_html=True)
-    st.stop()
+    stop_page()
 
 users = load_users()  # Load all users
 current_user = st.session_state.current_user
@@ -626,4 +630,7 @@ st.markdown("""
 <div class="footer">
     <p>🔄 Skill Swap • Share Knowledge, Grow Together • Uni-Sync Platform</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+debug_panel()
+end_rerun()
@@ -5,19 +5,25 @@ import streamlit.components.v1 as components  # Import components for JS executi
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add parent directory to path
 
-from src.data_manager import load_listings, load_users, save_listing
+from src.data_manager import load_listings, query_listings, save_listing, get_user_directory
+from src.ui_components import page_cursor, pager, debug_panel, stop_page
+from src.instrumentation import begin_rerun, end_rerun
 import pandas as pd
 import re
 import urllib.parse
 
+LISTINGS_PER_PAGE = 12
+
 if 'current_user' not in st.session_state:
     st.session_state.current_user = None
 
+begin_rerun("Dorm Deals")  # Profiling no-op unless UNISYNC_PROFILE=1
+
 st.set_page_config(page_title="Dorm Deals", page_icon="🏢", layout="wide")  # Configure page
 
 if 'current_user' not in st.session_state or st.session_state.current_user is None:  # Check authentication
     st.warning("🔒 Please login from the Home page to access Dorm Deals")
-    st.stop()
+    stop_page()
 
 try:
     with open("assets/style-dorm.css") as f:
@@ -103,11 +109,7 @@ st.markdown("### Your campus marketplace for rooms, furniture, and resources")
 st.caption("💡 Find great deals or post items you want to sell/give away")
 
 listings = load_listings()
-users = load_users()
-
-user_map = {}
-for user in users:
-    user_map[user['id']] = user
+user_directory = get_user_directory()
 
 st.sidebar.markdown("""
 <h3><span class="emoji-fix">🔍</span> Filters</h3>
@@ -143,11 +145,9 @@ free_only = st.sidebar.checkbox("✅ Free items only")  # Free items filter
 st.sidebar.markdown("---")
 st.sidebar.info(f"📊 Showing {len(listings)} listings")
 
-filtered_listings = []  # Apply all filters
-
-for listing in listings:
+def _matches_listing_filters(listing):  # Apply all filters
     if selected_type != "All" and listing.get('type', '').lower() != selected_type.lower():
-        continue
+        return False
 
     price_str = str(listing.get('price', '0'))  # Extract price value
     price_val = 0
@@ -165,17 +165,24 @@ for listing in listings:
         else:
              price_val = 0
     if price_val < price_range[0] or price_val > price_range[1]:
-        continue
+        return False
 
     if location_search:  # Filter by location
         loc = str(listing.get('location', '')).lower()
         if location_search.lower() not in loc:
-            continue
+            return False
 
     if free_only and price_val != 0:  # Filter free items only
-        continue
+        return False
 
-    filtered_listings.append(listing)
+    return True
+
+listings_cursor = page_cursor("listings", (selected_type, price_range, location_search, free_only))
+filtered_listings, next_listings_cursor = query_listings(
+    where=_matches_listing_filters,
+    limit=LISTINGS_PER_PAGE,
+    cursor=listings_cursor
+)
 
 st.subheader("📦 Available Listings")  # Display listings section
 
@@ -186,7 +193,7 @@ else:
     cols = st.columns(3)
     for idx, listing in enumerate(filtered_listings):
         with cols[idx % 3]:
-            poster_user = user_map.get(listing.get('user_id'))
+            poster_user = user_directory.by_id(listing.get('user_id'))
             poster_name = poster_user.get('name', 'Anonymous') if poster_user else 'Unknown'
             poster_email = poster_user.get('email', '') if poster_user else ''
 
@@ -220,6 +227,8 @@ else:
 
     st.markdown('</div>', unsafe_allow_html=True)
 
+pager("listings", next_listings_cursor)
+
 st.markdown("---")  # Section divider
 st.subheader("📝 Post Your Own Listing")
 st.caption("Have something to sell or give away? List it here!")
@@ -324,4 +333,7 @@ with col4:
         - Internet/WiFi problems
         - ID card issues
         - General complaints
-        """)
\ No newline at end of file
+        """)
+
+debug_panel()
+end_rerun()
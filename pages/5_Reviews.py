@@ -4,7 +4,13 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.data_manager import load_users, get_user_reviews
+from src.data_manager import query_reviews
+from src.ui_components import page_cursor, pager, debug_panel, stop_page
+from src.instrumentation import begin_rerun, end_rerun
+
+REVIEWS_PER_PAGE = 20
+
+begin_rerun("Reviews")  # Profiling no-op unless UNISYNC_PROFILE=1
 
 st.set_page_config(page_title="Reviews", page_icon="⭐", layout="wide")  # Configure page
 
@@ -71,7 +77,7 @@ st.markdown("""
 
 if 'current_user' not in st.session_state or st.session_state.current_user is None:
     st.warning("🔒 Please login to see reviews")
-    st.stop()
+    stop_page()
 
 st.markdown("""
 <div style="text-align: center; margin-bottom: 0.5rem;">
@@ -79,8 +85,6 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-users = load_users()
-
 st.sidebar.markdown("""
 <h3><span class="emoji-fix">🔍</span> Filter & Sort</h3>
 """, unsafe_allow_html=True)
@@ -96,45 +100,29 @@ show_only_reviewed = st.sidebar.checkbox("✅ Only show users with reviews", val
 
 st.sidebar.markdown("---")
 
-# Collect user data with reviews
-user_data = []
-for user in users:
-    reviews = get_user_reviews(user.get('id'))
-    
-    if reviews:
-        avg = sum(r['rating'] for r in reviews) / len(reviews)
-        user_data.append({
-            'user': user,
-            'reviews': reviews,
-            'avg_rating': avg,
-            'review_count': len(reviews)
-        })
-    elif not show_only_reviewed:
-        user_data.append({
-            'user': user,
-            'reviews': [],
-            'avg_rating': 0,
-            'review_count': 0
-        })
-
-# Apply filters
-filtered_data = [d for d in user_data if d['avg_rating'] >= min_rating or d['avg_rating'] == 0]
-
-# Sort data
-if sort_by == "Highest Rated":
-    filtered_data.sort(key=lambda x: x['avg_rating'], reverse=True)
-elif sort_by == "Lowest Rated":
-    filtered_data.sort(key=lambda x: x['avg_rating'] if x['avg_rating'] > 0 else 6)
-elif sort_by == "Most Reviews":
-    filtered_data.sort(key=lambda x: x['review_count'], reverse=True)
-elif sort_by == "Fewest Reviews":
-    filtered_data.sort(key=lambda x: x['review_count'])
-elif sort_by == "Name (A-Z)":
-    filtered_data.sort(key=lambda x: x['user'].get('name', ''))
-elif sort_by == "Name (Z-A)":
-    filtered_data.sort(key=lambda x: x['user'].get('name', ''), reverse=True)
-
-st.sidebar.info(f"📊 Showing {len(filtered_data)} users")
+# Sort options map to (sort key, descending)
+sort_options = {
+    "Highest Rated": ('avg_rating', True),
+    "Lowest Rated": ('avg_rating_unrated_last', False),
+    "Most Reviews": ('review_count', True),
+    "Fewest Reviews": ('review_count', False),
+    "Name (A-Z)": ('name', False),
+    "Name (Z-A)": ('name', True),
+}
+sort_key, descending = sort_options[sort_by]
+
+# Fetch one page of filtered and sorted users
+cursor = page_cursor("reviews", (min_rating, sort_by, show_only_reviewed))
+filtered_data, next_cursor = query_reviews(
+    min_rating=min_rating,
+    only_reviewed=show_only_reviewed,
+    sort_key=sort_key,
+    descending=descending,
+    limit=REVIEWS_PER_PAGE,
+    cursor=cursor
+)
+
+st.sidebar.info(f"📊 Showing {len(filtered_data)} users on this page")
 
 # Display filtered and sorted reviews
 for data in filtered_data:
@@ -148,8 +136,7 @@ for data in filtered_data:
             st.write(f"**Average Rating:** {'⭐' * int(avg_rating)} {round(avg_rating, 1)}/5.0")
             
             for review in reviews:
-                rater = next((u for u in users if u.get('id') == review['rater_id']), None)
-                rater_name = rater.get('name') if rater else 'Anonymous'
+                rater_name = review['rater_name']
                 
                 st.markdown(f"""
                 **{rater_name}** rated {'⭐' * review['rating']} ({review['rating']}/5)  
@@ -159,4 +146,9 @@ for data in filtered_data:
                 st.markdown("---")
     else:
         with st.expander(f"👤 {user.get('name')} - No reviews yet"):
-            st.info("💬 This user hasn't received any reviews yet.")
\ No newline at end of file
+            st.info("💬 This user hasn't received any reviews yet.")
+
+pager("reviews", next_cursor)
+
+debug_panel()
+end_rerun()
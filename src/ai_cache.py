@@ -0,0 +1,111 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from src import config
+
+_PUNCTUATION = re.compile(r"[^\w\s+#]")
+FILLER_WORDS = frozenset("""
+a an the please pls plz can could would you someone somebody anyone anybody is are there
+any some hey hi hello help find show tell get to for with on campus here
+""".split())  # Not "i", "me", "my" or "who": they say which side of a teach/learn request the asker is on
+
+
+def normalize_query(query):  # Fold case, punctuation, whitespace and filler words: "Can anyone teach me Python?" -> "teach me python"
+    words = _PUNCTUATION.sub(" ", str(query or "").casefold()).split()
+    kept = [w for w in words if w not in FILLER_WORDS]
+    return " ".join(kept or words)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY, query TEXT, response TEXT, size INTEGER NOT NULL,
+    created REAL NOT NULL, last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used);
+"""
+
+
+class ResponseCache:  # Answers keyed on normalized query + data version, shared by every process on the host
+    def __init__(self, db_path, ttl=86400, max_bytes=50 * 1024 * 1024):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def key(self, query, version):
+        return hashlib.sha256(f"{normalize_query(query)}\x00{version!r}".encode()).hexdigest()
+
+    def get(self, query, version):  # Cached answer or None; a hit refreshes the entry's LRU position
+        key = self.key(query, version)
+        conn = self._conn()
+        row = conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        now = time.time()
+        with conn:
+            if now - row[1] > self.ttl:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return row[0]
+
+    def put(self, query, version, response):
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, query, response, size, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.key(query, version), query, response, len(response.encode()), now, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):  # Drop expired entries, then least recently used ones until under the size cap
+        conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            if total - freed <= self.max_bytes:
+                break
+            victims.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def clear(self):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_response_cache():  # Process-wide cache from UNISYNC_AI_CACHE_*, None when disabled
+    global _cache
+    if _cache is None and config.AI_CACHE_PATH:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(config.AI_CACHE_PATH, config.AI_CACHE_TTL, config.AI_CACHE_MAX_MB * 1024 * 1024)
+    return _cache
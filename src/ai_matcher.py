@@ -1,46 +1,248 @@
-import google.generativeai as genai
+import logging
+import os
+import threading
+import time
+
+import google.ai.generativelanguage as glm
 import streamlit as st
 
-if 'api_key_index' not in st.session_state:
-    st.session_state.api_key_index = 0
-
-def get_next_api_key():
-    keys = [st.secrets.get(f"GEMINI_API_KEY_{i}") for i in range(1, 11)]
-    keys = [k for k in keys if k]
-    if not keys:
-        return None
-    key = keys[st.session_state.api_key_index % len(keys)]
-    st.session_state.api_key_index += 1
-    return key
-
-@st.cache_data(ttl=300)  # Cache results for 5 minutes
-def ai_assistant(query, users, listings):
-    import csv
-    
-    users_str = "\n".join([
-        f"• {u.get('name')}: Major={u.get('major')}, Year={u.get('year')}, "
-        f"Skills={u.get('skills')}, Can teach={u.get('can_teach')}, "
-        f"Wants to learn={u.get('wants_to_learn')}, Email={u.get('email')}"
-        for u in users if u
-    ])
-    
-    listings_str = "\n".join([
-        f"• {l.get('title')}: Type={l.get('type')}, Price={l.get('price')}, "
-        f"Location={l.get('location')}, Description={l.get('description')}"
-        for l in listings if l
-    ])
-    
+from src import config
+from src.ai_cache import get_response_cache, normalize_query
+from src.data_manager import data_version, recommend_peers, search_listings, search_users, similar_listings, similar_users
+from src.instrumentation import instrumented
+from src.key_pool import KeyPool, backoff_delay, estimate_tokens, is_rate_limit_error, retry_after
+from src.offline_matcher import offline_answer
+from src.prompt_context import LEGEND, build_context
+
+log = logging.getLogger(__name__)
+
+def _api_keys():  # GEMINI_API_KEY plus GEMINI_API_KEY_1 .. GEMINI_API_KEY_10 from Streamlit secrets or the environment
+    names = ["GEMINI_API_KEY"] + [f"GEMINI_API_KEY_{i}" for i in range(1, 11)]
     try:
-        with open('data/ratings.csv', 'r') as f:
-            ratings = list(csv.DictReader(f))
-            ratings_str = "\n".join([f"User {r['rater_id']} rated User {r['rated_id']}: {r['rating']}/5" for r in ratings[:50]])
-    except:
-        ratings_str = "No ratings available"
+        keys = [st.secrets.get(name) for name in names]
+    except FileNotFoundError:  # No secrets.toml
+        keys = []
+    keys += [os.environ.get(name) for name in names]
+    return tuple(dict.fromkeys(k for k in keys if k))
+
+_key_pool = None
+_key_pool_lock = threading.Lock()
+
+def get_key_pool():  # Shared by every session in the process; rebuilt if the configured keys change
+    global _key_pool
+    keys = _api_keys()
+    if _key_pool is None or _key_pool.keys != keys:
+        with _key_pool_lock:
+            if _key_pool is None or _key_pool.keys != keys:
+                _key_pool = KeyPool(keys, config.AI_KEY_RPM, config.AI_KEY_TPM, config.AI_KEY_COOLDOWN)
+                with _clients_lock:
+                    for stale in set(_clients) - set(keys):
+                        del _clients[stale]
+    return _key_pool
+
+_clients = {}  # API key -> GenerativeServiceClient with its own long-lived transport
+_clients_lock = threading.Lock()
+
+def _client_for(api_key):  # Per-key client, reused across requests and sessions (genai.configure() is process-global)
+    client = _clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                options = {"api_key": api_key}
+                if config.AI_ENDPOINT:
+                    options["api_endpoint"] = config.AI_ENDPOINT
+                client = _clients[api_key] = glm.GenerativeServiceClient(client_options=options,
+                                                                         transport=config.AI_TRANSPORT)
+    return client
+
+def _request(prompt):
+    model = config.AI_MODEL if config.AI_MODEL.startswith("models/") else f"models/{config.AI_MODEL}"
+    return glm.GenerateContentRequest(model=model, contents=[glm.Content(role="user", parts=[glm.Part(text=prompt)])])
+
+def _text(response):  # First candidate's text; raises like genai's response.text when there is none (blocked, safety stop)
+    candidates = response.candidates
+    if not candidates or not candidates[0].content.parts:
+        reason = candidates[0].finish_reason.name if candidates else response.prompt_feedback.block_reason.name
+        raise ValueError(f"Gemini returned no text (finish reason: {reason})")
+    return "".join(part.text for part in candidates[0].content.parts)
+
+AI_TABLES = ("users", "listings", "ratings")  # Everything the prompt is built from
+
+def _merge(records, extra, k, skip=()):  # Append unseen records from `extra` until there are k
+    seen = {record.get('id') for record in records}.union(skip)
+    for record in extra:
+        if len(records) >= k:
+            break
+        if record.get('id') not in seen:
+            seen.add(record.get('id'))
+            records.append(record)
+    return records
+
+def _top_up(matched, similar, query, k):  # Keyword hits first, then nearest vectors for typos and related wording
+    records = [record for record, _ in matched]
+    if len(records) < k:
+        _merge(records, [record for record, _ in similar(query, k)], k)
+    return records
+
+def _retrieve(query, user=None):  # (students, listings, topped up from the asker's profile) for the prompt
+    k_users, k_listings = config.AI_TOP_USERS, config.AI_TOP_LISTINGS
+    users = _top_up(search_users(query, k_users), similar_users, query, k_users)
+    listings = _top_up(search_listings(query, k_listings), similar_listings, query, k_listings)
+    from_profile = False
+    if user is not None and len(users) < k_users:  # "Find me a study buddy", "I need help": few words to search on
+        found = len(users)
+        peers = [peer for peer, _ in recommend_peers(user, k_users)]
+        interests = f"{user.get('wants_to_learn', '')} {user.get('major', '')}"
+        _merge(users, peers + [peer for peer, _ in similar_users(interests, 2 * k_users)], k_users, [user.get('id')])
+        from_profile = len(users) > found
+    if user is not None and len(listings) < k_listings and user.get('accommodation_need'):
+        found = len(listings)
+        _merge(listings, [listing for listing, _ in similar_listings(user.get('accommodation_need'), k_listings)], k_listings)
+        from_profile = from_profile or len(listings) > found
+    return users, listings, from_profile
+
+def _asker_version(query, version, user):  # Answers built from the asker's profile are cached and coalesced per asker
+    if user is not None and _retrieve(query, user)[2]:
+        return version, user.get('id')
+    return version
+
+class AIUnavailable(Exception):  # Message is shown to the student as the assistant's answer
+    pass
+
+def _cached_answer(query, version):
+    cache = get_response_cache()
+    return cache.get(query, version) if cache is not None else None
+
+def _remember(query, version, answer):
+    cache = get_response_cache()
+    if cache is not None:
+        cache.put(query, version, answer)
+
+def _fallback(query, user, error):  # Local matches when Gemini cannot answer, else the error itself
+    local = offline_answer(query, user)
+    if local is None:
+        return str(error)
+    return f"{local}\n\nℹ️ Offline matches: the AI assistant is unavailable right now."
+
+class _Flight:  # One Gemini request in progress; identical questions follow its chunks instead of calling again
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._chunks = []
+        self._finished = False
+        self._error = None
+
+    def publish(self, chunk):
+        with self._cond:
+            self._chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, error=None):
+        with self._cond:
+            self._finished = True
+            self._error = error
+            self._cond.notify_all()
+
+    def follow(self):  # Every chunk so far, then new ones as they arrive; re-raises the leader's AIUnavailable
+        seen = 0
+        while True:
+            with self._cond:
+                while seen == len(self._chunks) and not self._finished:
+                    self._cond.wait()
+                chunks = self._chunks[seen:]
+                finished, error = self._finished, self._error
+            seen += len(chunks)
+            yield from chunks
+            if finished and seen == len(self._chunks):
+                if error is not None:
+                    raise error
+                return
+
+_flights = {}  # (normalized query, data version) -> _Flight
+_flights_lock = threading.Lock()
+FLIGHT_STATS = {"leaders": 0, "followers": 0}
+
+def _coalesced(query, version, stream, user=None):  # Yield answer chunks; concurrent identical questions share one Gemini call
+    key = (normalize_query(query), version)
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+        FLIGHT_STATS["leaders" if leader else "followers"] += 1
+    if not leader:
+        yield from flight.follow()
+        return
+    parts = []
+    try:
+        for text in _generate(build_prompt(query, user), stream=stream):
+            parts.append(text)
+            flight.publish(text)
+            yield text
+        _remember(query, version, "".join(parts))  # Before finish(), so later askers hit the cache
+        flight.finish()
+    except AIUnavailable as e:
+        flight.finish(e)
+        raise
+    except BaseException:  # Leader stopped reading or crashed: followers must not wait forever
+        flight.finish(AIUnavailable("⚠️ The answer was cut off, please ask again."))
+        raise
+    finally:
+        with _flights_lock:
+            if _flights.get(key) is flight:
+                del _flights[key]
+
+@instrumented(name="ai_matcher.ai_assistant")
+def ai_assistant(query, version=None, user=None):  # version: data_version(*AI_TABLES) token, looked up when omitted
+    if version is None:
+        version = data_version(*AI_TABLES)
+    version = _asker_version(query, version, user)
+    cached = _cached_answer(query, version)
+    if cached is not None:
+        return cached
+    if config.AI_FAST_PATH:  # Simple skill / listing questions are answered locally
+        local = offline_answer(query, user, fast_path=True)
+        if local is not None:
+            return local
+    try:
+        return "".join(_coalesced(query, version, stream=False, user=user))
+    except AIUnavailable as e:  # Never persist errors or fallbacks
+        return _fallback(query, user, e)
+
+@instrumented(name="ai_matcher.ai_assistant_stream")
+def ai_assistant_stream(query, version=None, user=None):  # Like ai_assistant, but yields text chunks as Gemini produces them
+    if version is None:
+        version = data_version(*AI_TABLES)
+    version = _asker_version(query, version, user)
+    cached = _cached_answer(query, version)
+    if cached is not None:
+        yield cached
+        return
+    if config.AI_FAST_PATH:
+        local = offline_answer(query, user, fast_path=True)
+        if local is not None:
+            yield local
+            return
+    started = False
+    try:
+        for text in _coalesced(query, version, stream=True, user=user):
+            started = True
+            yield text
+    except AIUnavailable as e:
+        yield f"\n\n{e}" if started else _fallback(query, user, e)
+
+def build_prompt(query, user=None):  # Prompt for one question, built from the top retrieved candidates
+    matched_users, matched_listings, from_profile = _retrieve(query, user)
+    users_str, listings_str, stats = build_context(matched_users, matched_listings, config.AI_CONTEXT_TOKENS)
+    asker = ""
+    if from_profile:  # Tell Gemini who is asking: part of the candidates were picked from this profile
+        asker = (f"Asked by: {user.get('name')}|Maj:{user.get('major')}|L:{user.get('wants_to_learn')}|"
+                 f"T:{user.get('can_teach')} (some candidates below were picked from this profile)\n")
     
     prompt = f"""You are Uni-Sync AI, a smart campus matchmaking assistant at IIT Delhi.  # Build AI prompt
 
 Student query: "{query}"
-
+{asker}
 ANALYZE CAREFULLY:
 1. What do they need?
    - Study buddy for a specific course?
@@ -48,17 +250,14 @@ ANALYZE CAREFULLY:
    - Accommodation/room/furniture?
    - Something to buy/sell?
 
-2. Search through ALL available students and listings below
+2. Search through the best-matching students and listings below (pre-selected from the campus database)
 
-COMPLETE STUDENT DATABASE:
+MATCHING STUDENTS ({LEGEND}):
 {users_str}
 
-COMPLETE MARKETPLACE LISTINGS:
+MATCHING MARKETPLACE LISTINGS (title|type|price|location|description|status):
 {listings_str}
 
-USER RATINGS (Trust Scores):
-{ratings_str}
-
 YOUR RESPONSE MUST:
 1. Find 2-3 BEST matches with SPECIFIC reasons
 2. Include full names and contact emails
@@ -78,21 +277,48 @@ Format:
 
 Keep it under 300 words but be SPECIFIC with names and reasons.
 """
-    
-    max_retries = 10
-    for attempt in range(max_retries):
+    log.info("prompt tokens=%d context=%d/%d students=%d/%d listings=%d/%d", estimate_tokens(prompt),
+             stats["context_tokens"], stats["budget"], stats["users"], stats["users_retrieved"],
+             stats["listings"], stats["listings_retrieved"])
+    return prompt
+
+def _generate(prompt, stream=False):  # Yield answer text (chunk by chunk when streaming); raises AIUnavailable
+    pool = get_key_pool()
+    if not len(pool):
+        raise AIUnavailable("⚠️ AI features require API key. Please configure GEMINI_API_KEY in secrets.")
+    reserved = estimate_tokens(prompt) + config.AI_MAX_OUTPUT_TOKENS
+    error = None
+    for attempt in range(config.AI_MAX_ATTEMPTS):
+        state = pool.acquire(reserved, timeout=config.AI_KEY_WAIT)
+        if state is None:
+            raise AIUnavailable("⚠️ AI is busy right now, every API key is rate-limited. Please try again in a minute.")
+        produced = []
         try:
-            api_key = get_next_api_key()
-            if not api_key:
-                return "⚠️ AI features require API key. Please configure GEMINI_API_KEY in secrets."
-            
-            genai.configure(api_key=api_key)
-            model = genai.GenerativeModel('gemini-flash-latest')
-            response = model.generate_content(prompt)
-            return response.text
-            
+            client = _client_for(state.key)
+            if stream:
+                response = client.stream_generate_content(_request(prompt), timeout=config.AI_TIMEOUT)
+            else:
+                response = [client.generate_content(_request(prompt), timeout=config.AI_TIMEOUT)]
+            for chunk in response:
+                text = _text(chunk)
+                produced.append(text)
+                yield text
         except Exception as e:
-            if "quota" in str(e).lower() or "rate" in str(e).lower():
-                if attempt < max_retries - 1:
-                    continue
-            return f"⚠️ AI is temporarily unavailable: {str(e)}"
\ No newline at end of file
+            error = e
+            if is_rate_limit_error(e):
+                pool.rate_limited(state, retry_after(e))
+            else:
+                pool.failed(state)
+            if produced:  # Part of the answer is already on screen, so it cannot be retried transparently
+                raise AIUnavailable(f"⚠️ The answer was cut off: {str(e)}")
+            if not is_rate_limit_error(e):
+                break
+            if attempt < config.AI_MAX_ATTEMPTS - 1:
+                time.sleep(backoff_delay(attempt))
+            continue
+        except BaseException:  # Reader stopped early (closed generator, Streamlit rerun): free the key
+            pool.failed(state)
+            raise
+        pool.release(state, reserved, estimate_tokens(prompt) + estimate_tokens("".join(produced)))
+        return
+    raise AIUnavailable(f"⚠️ AI is temporarily unavailable: {str(error)}")
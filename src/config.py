@@ -0,0 +1,34 @@
+import os
+
+try:  # Pick up a local .env file when python-dotenv is installed
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+DATA_DIR = os.environ.get("UNISYNC_DATA_DIR", "data")  # Folder holding the CSV files / SQLite database
+STORAGE_BACKEND = os.environ.get("UNISYNC_STORAGE", "csv").lower()  # "csv" or "sqlite"
+SQLITE_PATH = os.environ.get("UNISYNC_SQLITE_PATH", os.path.join(DATA_DIR, "unisync.db"))
+APPEND_ONLY = os.environ.get("UNISYNC_APPEND_ONLY", "0") == "1"  # CSV: append connections/ratings instead of rewriting
+COMPACT_EVERY = int(os.environ.get("UNISYNC_COMPACT_EVERY", "500"))  # Appended ratings before a background compaction
+PROFILE = os.environ.get("UNISYNC_PROFILE", "0") == "1"  # Opt-in hot-path timing (see src/instrumentation.py)
+PROFILE_LOG = os.environ.get("UNISYNC_PROFILE_LOG", "")  # JSON-lines file that finished reruns are appended to
+PROFILE_HISTORY = int(os.environ.get("UNISYNC_PROFILE_HISTORY", "200"))  # Reruns kept in memory
+AI_TOP_USERS = int(os.environ.get("UNISYNC_AI_TOP_USERS", "15"))  # Students retrieved into each assistant prompt
+AI_TOP_LISTINGS = int(os.environ.get("UNISYNC_AI_TOP_LISTINGS", "10"))  # Listings retrieved into each assistant prompt
+AI_CONTEXT_TOKENS = int(os.environ.get("UNISYNC_AI_CONTEXT_TOKENS", "1500"))  # Budget for student + listing lines
+AI_CACHE_PATH = os.environ.get("UNISYNC_AI_CACHE_PATH", os.path.join(DATA_DIR, "ai_cache.db"))  # "" disables it
+AI_CACHE_TTL = int(os.environ.get("UNISYNC_AI_CACHE_TTL", "86400"))  # Seconds an answer stays valid
+AI_CACHE_MAX_MB = int(os.environ.get("UNISYNC_AI_CACHE_MAX_MB", "50"))  # Size cap before LRU eviction
+AI_KEY_RPM = int(os.environ.get("UNISYNC_AI_KEY_RPM", "15"))  # Requests per minute allowed per Gemini key
+AI_KEY_TPM = int(os.environ.get("UNISYNC_AI_KEY_TPM", "250000"))  # Tokens per minute allowed per Gemini key
+AI_KEY_COOLDOWN = float(os.environ.get("UNISYNC_AI_KEY_COOLDOWN", "30"))  # Base cooldown after a 429, doubles per repeat
+AI_KEY_WAIT = float(os.environ.get("UNISYNC_AI_KEY_WAIT", "5"))  # Longest a request waits for a free key
+AI_MAX_ATTEMPTS = int(os.environ.get("UNISYNC_AI_MAX_ATTEMPTS", "4"))  # Gemini calls per question, across keys
+AI_MODEL = os.environ.get("UNISYNC_AI_MODEL", "gemini-flash-latest")
+AI_MAX_OUTPUT_TOKENS = 600  # Reserved per request for the answer (~300 words)
+AI_STREAM = os.environ.get("UNISYNC_AI_STREAM", "1") == "1"  # Show assistant answers as they are generated
+AI_TIMEOUT = float(os.environ.get("UNISYNC_AI_TIMEOUT", "20"))  # Seconds before a Gemini call counts as failed
+AI_FAST_PATH = os.environ.get("UNISYNC_AI_FAST_PATH", "1") == "1"  # Answer simple skill / listing questions locally
+AI_ENDPOINT = os.environ.get("UNISYNC_AI_ENDPOINT", "")  # e.g. http://127.0.0.1:8765 for benchmarks/fake_gemini.py
+AI_TRANSPORT = os.environ.get("UNISYNC_AI_TRANSPORT", "rest" if AI_ENDPOINT.startswith("http") else "") or None
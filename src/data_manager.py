@@ -1,214 +1,413 @@
-import pandas as pd
-import os
+import base64
 import hashlib
+import heapq
+import json
+import threading
+from datetime import datetime
+
+from src.indexes import CompatibilityIndex, ConnectionIndex, RatingIndex, SearchIndex, UserDirectory, VectorIndex
+from src.instrumentation import instrumented
+from src.models import MODELS, Connection, Listing, Rating, User
+from src.storage import get_storage
 
 def hash_password(password):
     return hashlib.sha256(password.encode()).hexdigest()
 
-def init_data():  # Initialize data files if they don't exist
-    
-    os.makedirs("data", exist_ok=True)  # Create data directory
-    
-    if not os.path.exists("data/users.csv") or os.path.getsize("data/users.csv") == 0:  # Create users CSV with sample data
-        sample_users = [
-            {
-                "id": 1,
-                "name": "Alex Chen",
-                "email": "alex@campus.edu",
-                "year": "Junior",
-                "major": "Computer Science",
-                "skills": "Python, Machine Learning, Guitar",
-                "interests": "AI Research, Music, Hiking",
-                "x_factor": "🔥 Can teach Python in 30 mins",
-                "can_teach": "Python basics, Guitar chords",
-                "wants_to_learn": "Data Visualization, Spanish",
-                "accommodation_need": "Looking for room near campus"
-            },
-            {
-                "id": 2,
-                "name": "Sam Patel",
-                "email": "sam@campus.edu",
-                "year": "Sophomore",
-                "major": "Business + Design",
-                "skills": "UI/UX Design, Public Speaking, Cooking",
-                "interests": "Startups, Photography, Basketball",
-                "x_factor": "🎤 Won campus debate championship",
-                "can_teach": "Figma design, Presentation skills",
-                "wants_to_learn": "Data Analysis, Python",
-                "accommodation_need": "Has extra furniture to give"
-            }
-        ]
-        pd.DataFrame(sample_users).to_csv("data/users.csv", index=False)
-    
-    if not os.path.exists("data/listings.csv") or os.path.getsize("data/listings.csv") == 0:  # Create listings CSV with sample data
-        sample_listings = [
-            {
-                "id": 1,
-                "user_id": 2,
-                "type": "furniture",
-                "title": "Study Desk with Chair",
-                "description": "Good condition, moving out",
-                "location": "Dorm B, Block 3",
-                "price": "Free",
-                "status": "available"
-            },
-            {
-                "id": 2,
-                "user_id": 1,
-                "type": "room",
-                "title": "Room available for sharing",
-                "description": "Private room in 3BHK, near campus",
-                "location": "10 min from college",
-                "price": "$300/month",
-                "status": "available"
-            }
-        ]
-        pd.DataFrame(sample_listings).to_csv("data/listings.csv", index=False)
-
-def load_users():  # Load users from CSV
-    try:
-        if os.path.exists("data/users.csv"):
-            return pd.read_csv("data/users.csv").to_dict('records')
-    except:
-        pass
-    return []
+SAMPLE_USERS = [
+    {
+        "id": 1,
+        "name": "Alex Chen",
+        "email": "alex@campus.edu",
+        "year": "Junior",
+        "major": "Computer Science",
+        "skills": "Python, Machine Learning, Guitar",
+        "interests": "AI Research, Music, Hiking",
+        "x_factor": "🔥 Can teach Python in 30 mins",
+        "can_teach": "Python basics, Guitar chords",
+        "wants_to_learn": "Data Visualization, Spanish",
+        "accommodation_need": "Looking for room near campus"
+    },
+    {
+        "id": 2,
+        "name": "Sam Patel",
+        "email": "sam@campus.edu",
+        "year": "Sophomore",
+        "major": "Business + Design",
+        "skills": "UI/UX Design, Public Speaking, Cooking",
+        "interests": "Startups, Photography, Basketball",
+        "x_factor": "🎤 Won campus debate championship",
+        "can_teach": "Figma design, Presentation skills",
+        "wants_to_learn": "Data Analysis, Python",
+        "accommodation_need": "Has extra furniture to give"
+    }
+]
 
-def load_listings():  # Load listings from CSV
-    try:
-        if os.path.exists("data/listings.csv"):
-            return pd.read_csv("data/listings.csv").to_dict('records')
-    except:
-        pass
-    return []
-
-def save_user(user_data):  # Save new user to CSV
-    df = pd.read_csv("data/users.csv")
-    new_id = len(df) + 1
-    user_data['id'] = new_id
-    df = pd.concat([df, pd.DataFrame([user_data])], ignore_index=True)
-    df.to_csv("data/users.csv", index=False)
-    return new_id
-
-def load_passwords():  # Load passwords from CSV
-    try:
-        if os.path.exists("data/passwords.csv"):
-            return pd.read_csv("data/passwords.csv").to_dict('records')
-    except:
-        pass
-    return []
-
-def save_password(email, password):  # Save password to CSV
-    if os.path.exists("data/passwords.csv"):
-        df = pd.read_csv("data/passwords.csv")
-    else:
-        df = pd.DataFrame(columns=['email', 'password'])
-    
-    new_entry = pd.DataFrame([{'email': email, 'password': hash_password(password)}])
-    df = pd.concat([df, new_entry], ignore_index=True)
-    df.to_csv("data/passwords.csv", index=False)
+SAMPLE_LISTINGS = [
+    {
+        "id": 1,
+        "user_id": 2,
+        "type": "furniture",
+        "title": "Study Desk with Chair",
+        "description": "Good condition, moving out",
+        "location": "Dorm B, Block 3",
+        "price": "Free",
+        "status": "available"
+    },
+    {
+        "id": 2,
+        "user_id": 1,
+        "type": "room",
+        "title": "Room available for sharing",
+        "description": "Private room in 3BHK, near campus",
+        "location": "10 min from college",
+        "price": "$300/month",
+        "status": "available"
+    }
+]
+
+@instrumented
+def init_data():  # Initialize data files / tables if they don't exist
+    storage = get_storage()
+    storage.seed("users", SAMPLE_USERS)
+    storage.seed("listings", SAMPLE_LISTINGS)
+    for table in ("passwords", "connections", "ratings"):
+        storage.seed(table, [])
+
+_record_cache = {}  # table -> (storage version, tuple of typed records)
+_index_cache = {}  # index name -> (tables, storage versions, index)
+_cache_lock = threading.RLock()
+
+def _cached_load(table):  # Parse a table once per storage version and share it across sessions
+    storage = get_storage()
+    version = storage.version(table)
+    cached = _record_cache.get(table)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    with _cache_lock:
+        cached = _record_cache.get(table)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        model = MODELS[table]
+        records = tuple(model.from_row(r) for r in storage.load(table))
+        _record_cache[table] = (version, records)
+        return records
+
+def _cached_index(name, tables, build):  # Build an index from one or more tables once per storage version
+    storage = get_storage()
+    versions = tuple(storage.version(t) for t in tables)
+    cached = _index_cache.get(name)
+    if cached is not None and cached[1] == versions:
+        return cached[2]
+    with _cache_lock:
+        cached = _index_cache.get(name)
+        if cached is not None and cached[1] == versions:
+            return cached[2]
+        index = build(*[_cached_load(t) for t in tables])
+        _index_cache[name] = (tables, versions, index)  # Versions from before the load: a racing write forces a rebuild
+        return index
+
+def _patch_index(name, table, version_before, apply):  # Update a live index in place after our own write
+    storage = get_storage()
+    cached = _index_cache.get(name)
+    if cached is not None:
+        tables, versions, index = cached
+        current = tuple(storage.version(t) for t in tables)
+        expected = tuple(version_before if t == table else v for t, v in zip(tables, current))
+        if versions == expected:
+            apply(index)  # Index methods take the index's own lock, so readers never see a half-applied add
+            _index_cache[name] = (tables, current, index)
+            return
+    _index_cache.pop(name, None)  # Missed someone else's write; rebuild on next use
+
+def invalidate_cache(*tables):  # Drop cached records and indexes so the next load re-reads storage
+    with _cache_lock:
+        if not tables:
+            _record_cache.clear()
+            _index_cache.clear()
+            return
+        for table in tables:
+            _record_cache.pop(table, None)
+        for name, entry in list(_index_cache.items()):
+            if set(entry[0]) & set(tables):
+                del _index_cache[name]
+
+def _write(table, write, patches=()):  # Run a storage write, then patch or drop dependent caches
+    storage = get_storage()
+    with _cache_lock:
+        version_before = storage.version(table)
+        result = write(storage)
+        _record_cache.pop(table, None)
+        for name, apply in patches:
+            _patch_index(name, table, version_before, apply)
+        return result
+
+def data_version(*tables):  # Cheap token that changes whenever one of the tables is written
+    storage = get_storage()
+    return tuple(storage.version(t) for t in tables)
+
+@instrumented
+def get_user_directory():  # Shared email / id lookups over users and passwords
+    return _cached_index("directory", ("users", "passwords"), UserDirectory)
+
+@instrumented
+def get_compatibility_index():  # Batch compatibility scores over all users, same numbers as calculate_compatibility
+    return _cached_index("compatibility", ("users",), CompatibilityIndex)
 
+@instrumented
+def load_users():  # Load all user profiles
+    return _cached_load("users")
+
+@instrumented
+def load_listings():  # Load all marketplace listings
+    return _cached_load("listings")
+
+@instrumented
+def save_user(user_data):  # Save new user, returns the assigned id
+    return _write("users", lambda storage: storage.insert("users", user_data),
+                  [("directory", lambda directory: directory.add_user(User.from_row(user_data))),
+                   ("user_search", lambda index: index.add(User.from_row(user_data))),
+                   ("user_vectors", lambda index: index.add(User.from_row(user_data))),
+                   ("compatibility", lambda index: index.add(User.from_row(user_data)))])
+
+@instrumented
+def load_passwords():  # Load email / password-hash pairs
+    return _cached_load("passwords")
+
+@instrumented
+def save_password(email, password):  # Store hashed password for a new account
+    hashed = hash_password(password)
+    _write("passwords", lambda storage: storage.insert("passwords", {'email': email, 'password': hashed}),
+           [("directory", lambda directory: directory.set_password(email, hashed))])
+
+@instrumented
 def verify_password(email, password):  # Verify login credentials
-    passwords = load_passwords()
-    for entry in passwords:
-        if entry.get('email', '').lower() == email.lower() and entry.get('password') == hash_password(password):
-            return True
-    return False
+    return get_user_directory().check_password(email, hash_password(password))
+
+@instrumented
+def get_user_by_email(email):  # Case-insensitive profile lookup, None if unknown
+    return get_user_directory().by_email(email)
 
+@instrumented
+def email_exists(email):
+    return get_user_directory().has_email(email)
+
+@instrumented
 def reset_password(email, new_password):  # Reset password for existing user
-    if not os.path.exists("data/passwords.csv"):
-        return False
-    
-    df = pd.read_csv("data/passwords.csv")
-    if email.lower() in df['email'].str.lower().values:
-        df.loc[df['email'].str.lower() == email.lower(), 'password'] = hash_password(new_password)
-        df.to_csv("data/passwords.csv", index=False)
-        return True
-    return False
-
-def save_connection(user1_id, user2_id, connection_type):  # Save connection to CSV
-    import pandas as pd
-    from datetime import datetime
-    
-    if not os.path.exists("data/connections.csv"):
-        df = pd.DataFrame(columns=['user1_id', 'user2_id', 'connection_type', 'timestamp'])
-    else:
-        df = pd.read_csv("data/connections.csv")
-    
-    new_connection = {
+    hashed = hash_password(new_password)
+    return _write("passwords", lambda storage: storage.set_password(email, hashed),
+                  [("directory", lambda directory: directory.has_password(email) and directory.set_password(email, hashed))])
+
+@instrumented
+def save_connection(user1_id, user2_id, connection_type):  # Record a connection between two users
+    row = {
         'user1_id': user1_id,
         'user2_id': user2_id,
         'connection_type': connection_type,
         'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
-    
-    df = pd.concat([df, pd.DataFrame([new_connection])], ignore_index=True)
-    df.to_csv("data/connections.csv", index=False)
-
-def save_listing(listing_data):  # Save listing to CSV
-    if os.path.exists("data/listings.csv"):
-        df = pd.read_csv("data/listings.csv")
-        new_id = len(df) + 1
-    else:
-        df = pd.DataFrame(columns=["id", "user_id", "type", "title", "description", "location", "price", "status"])
-        new_id = 1
+    _write("connections", lambda storage: storage.insert("connections", dict(row)),
+           [("connections", lambda index: index.add(Connection.from_row(row)))])
 
-    listing_data['id'] = new_id
-    df = pd.concat([df, pd.DataFrame([listing_data])], ignore_index=True)
-    df.to_csv("data/listings.csv", index=False)
-    return new_id
+@instrumented
+def save_listing(listing_data):  # Save new listing, returns the assigned id
+    return _write("listings", lambda storage: storage.insert("listings", listing_data),
+                  [("listing_search", lambda index: index.add(Listing.from_row(listing_data))),
+                   ("listing_vectors", lambda index: index.add(Listing.from_row(listing_data)))])
 
+def _connection_index():
+    return _cached_index("connections", ("connections",), ConnectionIndex)
+
+@instrumented
 def get_user_connections(user_id):  # Get all connections for a user
-    if not os.path.exists("data/connections.csv"):
-        return []
-
-    df = pd.read_csv("data/connections.csv")
-    connections = df[(df['user1_id'] == user_id) | (df['user2_id'] == user_id)]
-    return connections.to_dict('records')
-
-def save_rating(rater_id, rated_id, rating, review=""):  # Save rating to CSV
-    from datetime import datetime
-    
-    if not os.path.exists("data/ratings.csv"):
-        df = pd.DataFrame(columns=['rater_id', 'rated_id', 'rating', 'review', 'timestamp'])
-    else:
-        df = pd.read_csv("data/ratings.csv")
-    
-    existing = df[(df['rater_id'] == rater_id) & (df['rated_id'] == rated_id)]
-    if not existing.empty:
-        df.loc[(df['rater_id'] == rater_id) & (df['rated_id'] == rated_id), 'rating'] = rating
-        df.loc[(df['rater_id'] == rater_id) & (df['rated_id'] == rated_id), 'review'] = review
-        df.loc[(df['rater_id'] == rater_id) & (df['rated_id'] == rated_id), 'timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return _connection_index().rows(user_id)
+
+@instrumented
+def get_user_neighbors(user_id, connection_type=None):  # [(peer_id, type, timestamp)], e.g. 'peer_match' or 'dorm_interest_*'
+    return _connection_index().neighbors(user_id, connection_type)
+
+@instrumented
+def recommend_peers(user, k=10, exclude=()):  # Top-k [(peer, score)] who teach what `user` wants to learn or vice versa
+    connected = {peer for peer, _, _ in _connection_index().neighbors(user.get('id'), 'peer_match')}
+    return get_compatibility_index().recommend(user, k, connected.union(exclude))
+
+@instrumented
+def get_users_by_ids(user_ids):  # Resolve user ids to profiles, skipping unknown ids
+    directory = get_user_directory()
+    return [user for user in map(directory.by_id, user_ids) if user is not None]
+
+@instrumented
+def save_rating(rater_id, rated_id, rating, review=""):  # Save or replace a rating
+    row = {
+        'rater_id': rater_id,
+        'rated_id': rated_id,
+        'rating': rating,
+        'review': review,
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+    _write("ratings", lambda storage: storage.upsert_rating(row),
+           [("ratings", lambda index: index.apply(rater_id, rated_id, rating)),
+            ("reviews", lambda reviews: _replace_review(reviews, Rating.from_row(row)))])
+
+def _rating_index():
+    return _cached_index("ratings", ("ratings",), RatingIndex)
+
+def _group_received(ratings):  # rated_id -> tuple of Rating records, in table order
+    received = {}
+    for r in ratings:
+        received.setdefault(r.rated_id, []).append(r)
+    return {rated_id: tuple(reviews) for rated_id, reviews in received.items()}
+
+def _replace_review(received, rating):  # Swap in a new tuple so readers never see one being changed
+    reviews = received.get(rating.rated_id, ())
+    if any(r.rater_id == rating.rater_id for r in reviews):
+        reviews = tuple(rating if r.rater_id == rating.rater_id else r for r in reviews)
     else:
-        new_rating = {
-            'rater_id': rater_id,
-            'rated_id': rated_id,
-            'rating': rating,
-            'review': review,
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        df = pd.concat([df, pd.DataFrame([new_rating])], ignore_index=True)
-    
-    df.to_csv("data/ratings.csv", index=False)
-
-def get_user_rating(user_id):  # Get average rating for a user
-    if not os.path.exists("data/ratings.csv"):
-        return 0, 0
-    
-    df = pd.read_csv("data/ratings.csv")
-    user_ratings = df[df['rated_id'] == user_id]
-    
-    if user_ratings.empty:
-        return 0, 0
-    
-    avg_rating = user_ratings['rating'].mean()
-    num_ratings = len(user_ratings)
-    
-    return round(avg_rating, 1), num_ratings
+        reviews += (rating,)
+    received[rating.rated_id] = reviews
+
+@instrumented
+def get_user_rating(user_id):  # Get average rating for a user as (avg, count)
+    return _rating_index().summary(user_id)
+
+@instrumented
+def get_ratings_for(user_ids):  # Bulk variant of get_user_rating: {user_id: (avg, count)}
+    index = _rating_index()
+    return {user_id: index.summary(user_id) for user_id in user_ids}
+
+@instrumented
+def get_rating_distribution(user_id):  # Number of 1..5 star ratings a user received
+    return _rating_index().distribution(user_id)
 
+@instrumented
 def get_user_reviews(user_id):  # Get all reviews for a user
-    if not os.path.exists("data/ratings.csv"):
-        return []
-    
-    df = pd.read_csv("data/ratings.csv")
-    reviews = df[df['rated_id'] == user_id]
-    return reviews.to_dict('records')
\ No newline at end of file
+    return list(_cached_index("reviews", ("ratings",), _group_received).get(user_id, ()))
+
+def _group_reviews(users, ratings):  # rated_id -> {'reviews', 'avg_rating', 'review_count'} in one pass
+    names = {user.id: user.name for user in users}
+    grouped = {}
+    for r in ratings:
+        group = grouped.setdefault(r.rated_id, {'reviews': [], 'rating_sum': 0})
+        group['reviews'].append({'rater_id': r.rater_id, 'rated_id': r.rated_id, 'rating': r.rating, 'review': r.review,
+                                 'timestamp': r.timestamp, 'rater_name': names.get(r.rater_id) or 'Anonymous'})
+        group['rating_sum'] += r.rating
+    for group in grouped.values():
+        group['review_count'] = len(group['reviews'])
+        group['avg_rating'] = group.pop('rating_sum') / group['review_count']
+    return grouped
+
+@instrumented
+def load_reviews_grouped():  # All reviews grouped by rated user, rater names joined; shared, rebuilt when users or ratings change
+    return _cached_index("reviews_grouped", ("users", "ratings"), _group_reviews)
+
+
+USER_SEARCH_FIELDS = {'can_teach': 3, 'skills': 2, 'wants_to_learn': 2, 'major': 1.5}
+LISTING_SEARCH_FIELDS = {'title': 3, 'type': 2, 'description': 1}
+
+@instrumented
+def search_users(query, k=10):  # Top-k [(user, score)] by keyword overlap with the query
+    index = _cached_index("user_search", ("users",), lambda users: SearchIndex(USER_SEARCH_FIELDS, users))
+    return index.search(query, k)
+
+@instrumented
+def search_listings(query, k=10):  # Top-k [(listing, score)] by keyword overlap with the query
+    index = _cached_index("listing_search", ("listings",), lambda listings: SearchIndex(LISTING_SEARCH_FIELDS, listings))
+    return index.search(query, k)
+
+
+USER_VECTOR_FIELDS = {'can_teach': 1.5, 'wants_to_learn': 1.5, 'skills': 1, 'interests': 1}
+LISTING_VECTOR_FIELDS = {'title': 2, 'description': 1}
+
+@instrumented
+def similar_users(query, k=10):  # Top-k [(user, cosine)] by hashed TF-IDF similarity; tolerates typos and word forms
+    index = _cached_index("user_vectors", ("users",), lambda users: VectorIndex(USER_VECTOR_FIELDS, users))
+    return index.search(query, k)
+
+@instrumented
+def similar_listings(query, k=10):  # Top-k [(listing, cosine)] by hashed TF-IDF similarity
+    index = _cached_index("listing_vectors", ("listings",), lambda listings: VectorIndex(LISTING_VECTOR_FIELDS, listings))
+    return index.search(query, k)
+
+
+def _sort_value(value):  # Comparable across missing / numeric / text values
+    if value is None or (isinstance(value, float) and value != value):
+        return [0, ""]
+    if isinstance(value, (int, float)):
+        return [1, value]
+    return [2, str(value).casefold()]
+
+def _encode_cursor(sort_key, descending, position):
+    payload = json.dumps({"s": sort_key, "d": descending, "p": position}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def _decode_cursor(cursor, sort_key, descending):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("invalid pagination cursor")
+    if payload.get("s") != sort_key or payload.get("d") != descending:
+        raise ValueError("pagination cursor belongs to a different sort order")
+    return payload["p"]
+
+def _matches_filters(row, filters):  # Exact match per field, case-insensitive for text
+    for field, expected in filters.items():
+        value = row.get(field)
+        if isinstance(value, str) and isinstance(expected, str):
+            if value.casefold() != expected.casefold():
+                return False
+        elif value != expected:
+            return False
+    return True
+
+def _paginate(items, sort_fn, id_fn, sort_key, limit, cursor, descending):  # Keyset page of at most `limit` items
+    position = _decode_cursor(cursor, sort_key, descending) if cursor else None
+    key = lambda item: [_sort_value(sort_fn(item)), id_fn(item)]
+    if position is not None:
+        if descending:
+            items = (item for item in items if key(item) < position)
+        else:
+            items = (item for item in items if key(item) > position)
+    select = heapq.nlargest if descending else heapq.nsmallest
+    page = select(limit + 1, items, key=key)  # Holds only limit + 1 items in memory
+    next_cursor = _encode_cursor(sort_key, descending, key(page[limit - 1])) if len(page) > limit else None
+    return page[:limit], next_cursor
+
+def _query_table(table, filters, where, sort_key, descending, limit, cursor):
+    rows = _cached_load(table)
+    if filters or where:
+        rows = (r for r in rows if (not filters or _matches_filters(r, filters)) and (where is None or where(r)))
+    return _paginate(rows, lambda r: r.get(sort_key), lambda r: r.get('id'), sort_key, limit, cursor, descending)
+
+@instrumented
+def query_users(filters=None, where=None, sort_key='id', descending=False, limit=20, cursor=None):  # -> (users, next_cursor)
+    return _query_table("users", filters, where, sort_key, descending, limit, cursor)
+
+@instrumented
+def query_listings(filters=None, where=None, sort_key='id', descending=False, limit=20, cursor=None):  # -> (listings, next_cursor)
+    return _query_table("listings", filters, where, sort_key, descending, limit, cursor)
+
+REVIEW_SORT_KEYS = {  # Keys over (user, review group) pairs
+    'avg_rating': lambda entry: entry[1]['avg_rating'],
+    'avg_rating_unrated_last': lambda entry: entry[1]['avg_rating'] if entry[1]['avg_rating'] > 0 else 6,
+    'review_count': lambda entry: entry[1]['review_count'],
+    'name': lambda entry: entry[0].name,
+}
+NO_REVIEWS = {'reviews': [], 'avg_rating': 0, 'review_count': 0}
+
+@instrumented
+def query_reviews(min_rating=1, only_reviewed=True, sort_key='avg_rating', descending=True, limit=20, cursor=None):
+    # Page of {'user', 'reviews', 'avg_rating', 'review_count'} entries -> (entries, next_cursor)
+    grouped = load_reviews_grouped()
+
+    def entries():  # Pairs into the shared grouping; only the page gets its own dicts
+        for user in load_users():
+            group = grouped.get(user.id)
+            if group is None:
+                if only_reviewed:
+                    continue
+                group = NO_REVIEWS
+            if group['avg_rating'] >= min_rating or group['avg_rating'] == 0:
+                yield user, group
+
+    page, next_cursor = _paginate(entries(), REVIEW_SORT_KEYS[sort_key], lambda entry: entry[0].id,
+                                  sort_key, limit, cursor, descending)
+    return [dict(group, user=user) for user, group in page], next_cursor
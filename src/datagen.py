@@ -0,0 +1,207 @@
+"""Synthetic campus dataset generator for scale testing.
+
+Writes users, passwords, listings, connections and ratings CSVs in the
+same schema as data/, e.g.:
+
+    python -m src.datagen --users 10000 --seed 42 --out data_synthetic/10k
+    UNISYNC_DATA_DIR=data_synthetic/10k streamlit run 1_Home.py
+
+Every generated account uses the password given by --password.
+"""
+import argparse
+import csv
+import os
+import random
+from datetime import datetime, timedelta
+
+from faker import Faker
+
+from src.data_manager import hash_password
+from src.storage import COLUMNS
+
+# Skill vocabularies follow the keyword categories used by pages/3_Skill_Swap.py
+TEACH_SKILLS = {
+    "tech": ["Python basics", "Advanced Python", "Java", "Web Development", "Data Visualization",
+             "Programming in C", "MATLAB", "CAD modelling", "SolidWorks", "Embedded Systems"],
+    "music": ["Guitar chords", "Music theory", "Singing", "Piano"],
+    "art": ["Figma design", "UI/UX design", "Photography", "Sketching", "Digital art"],
+    "academic": ["Calculus tutoring", "Statistics", "Organic Chemistry", "Discrete Math"],
+    "language": ["Spanish", "French language", "German language"],
+    "other": ["Presentation skills", "Public Speaking", "Cooking", "Chess", "Yoga"],
+}
+LEARN_SKILLS = {
+    "tech": ["Python", "Java", "Web Development", "Data Analysis", "Machine Learning", "AI",
+             "Cloud Computing", "Backend Development", "React", "Programming"],
+    "music": ["Music Production", "Music theory"],
+    "art": ["UI/UX", "Graphic Design"],
+    "academic": ["Calculus", "Advanced Math", "Leadership"],
+    "language": ["Spanish", "Japanese language"],
+    "other": ["Public Speaking", "Cooking", "Chess", "Investing"],
+}
+SKILLS = ["Python", "Machine Learning", "Guitar", "Circuit Design", "Public Speaking", "Cooking",
+          "Web Development", "Data Science", "Photography", "Calculus", "Statistics", "Chess",
+          "UI/UX Design", "CAD", "Robotics", "Writing", "Badminton", "Video Editing"]
+INTERESTS = ["AI Research", "Music", "Hiking", "Startups", "Photography", "Basketball", "AI Ethics",
+             "Art", "Travel", "Math Olympiad", "Coding", "Reading", "Gaming", "Cricket", "Films",
+             "Open Source", "Robotics", "Debating", "Sustainability", "Dance"]
+MAJORS = ["Computer Science", "Electrical Engineering", "Mechanical Engineering", "Mathematics",
+          "Civil Engineering", "Chemical Engineering", "Physics", "Biotechnology", "Economics",
+          "Design", "Engineering Physics", "Textile Engineering"]
+YEARS = ["1st Year", "2nd Year", "3rd Year", "4th Year", "Alumni"]
+X_FACTORS = ["🔥 Can teach {skill} in 30 mins", "🏆 Won inter-IIT {skill} contest",
+             "🌟 Runs the campus {skill} club", "🎤 Gave a TEDx talk on {skill}"]
+ACCOMMODATION = ["Looking for room near campus", "Has extra furniture to give",
+                 "Looking for hostel roommate", "Looking for internship housing", "None"]
+LOCATIONS = ["Hauz Khas, New Delhi", "Boys Hostel, IIT Delhi", "Girls Hostel, IIT Delhi",
+             "Dorm B, Block 3, IIT Delhi", "Ber Sarai, New Delhi", "Katwaria Sarai, New Delhi",
+             "Hostel Room 405, IIT Delhi", "Munirka, New Delhi"]
+REVIEWS = {  # score -> review texts
+    1: ["Did not show up for the session.", "Not helpful at all, unfortunately."],
+    2: ["Knows the topic but was hard to follow.", "Session felt rushed and disorganised."],
+    3: ["Informative but could be more interactive.", "Decent session, moved a bit too quickly."],
+    4: ["Great teacher and very patient!", "Practical tips that really helped me improve."],
+    5: ["Best tutor on campus, made it super easy to understand!", "Amazing session, very engaging and practical!"],
+}
+LISTING_TEMPLATES = {  # type -> [(title, description, price range)]
+    "room": [("Room available for sharing", "Private room in 3BHK, near campus", (8000, 20000)),
+             ("PG bed available", "Meals included, 10 min walk", (6000, 12000))],
+    "furniture": [("Study Desk with Chair", "Good condition, moving out", (500, 3000)),
+                  ("Bookshelf", "Wooden, 5 shelves", (300, 1500)),
+                  ("Mattress", "Single bed, barely used", (800, 2500))],
+    "textbook": [("Calculus textbook", "Thomas' Calculus, 14th edition", (200, 900)),
+                 ("Data Structures notes", "Handwritten, complete semester", (100, 400))],
+    "electronics": [("Laptop Stand", "Adjustable height, barely used", (300, 1200)),
+                    ("Scientific Calculator", "Casio fx-991ES", (400, 1000)),
+                    ("Monitor 24 inch", "1080p, HDMI cable included", (4000, 9000))],
+    "other": [("Cycle", "Hero Sprint, new tyres", (1500, 5000)),
+              ("Cricket kit", "Bat, pads and gloves", (800, 3000))],
+}
+
+
+def _pick_skills(rng, vocab, low, high):
+    categories = list(vocab)
+    picks = []
+    for _ in range(rng.randint(low, high)):
+        skill = rng.choice(vocab[rng.choice(categories)])
+        if skill not in picks:
+            picks.append(skill)
+    return ", ".join(picks)
+
+
+def _price(rng, listing_type, price_range):  # Formats understood by pages/4_Dorm_Deals.py
+    roll = rng.random()
+    if roll < 0.15 and listing_type != "room":
+        return "Free"
+    low, high = price_range
+    value = rng.randrange(low, high + 1, 50 if high > 1000 else 10)
+    if listing_type == "room":
+        return f"₹{value}/month"
+    if roll < 0.3:
+        return f"₹{value}-{value + rng.choice([100, 200, 500])}"
+    return f"₹{value}"
+
+
+def _timestamp(rng, start, days):
+    return (start + timedelta(seconds=rng.randrange(days * 86400))).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def generate(out_dir, users=1000, seed=42, listings_per_user=0.3, connections_per_user=3.0,
+             ratings_per_user=2.0, password="password123"):  # Write all five tables, returns row counts
+    rng = random.Random(seed)
+    fake = Faker("en_IN")
+    fake.seed_instance(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    start = datetime(2025, 8, 1)
+    counts = {}
+
+    def write(table, rows):
+        with open(os.path.join(out_dir, f"{table}.csv"), "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS[table])
+            n = 0
+            for row in rows:
+                writer.writerow(row)
+                n += 1
+        counts[table] = n
+
+    emails = []
+
+    def user_rows():
+        for user_id in range(1, users + 1):
+            first, last = fake.first_name(), fake.last_name()
+            email = f"{first.lower()}.{last.lower()}{user_id}@campus.edu".replace(" ", "")
+            emails.append(email)
+            teaches = rng.random() > 0.2
+            can_teach = _pick_skills(rng, TEACH_SKILLS, 1, 3) if teaches else "None yet"
+            x_factor = (rng.choice(X_FACTORS).format(skill=can_teach.split(",")[0])
+                        if teaches else "📚 Currently a learner only")
+            yield [user_id, f"{first} {last}", email, rng.choice(YEARS), rng.choice(MAJORS),
+                   ", ".join(rng.sample(SKILLS, rng.randint(2, 4))),
+                   ", ".join(rng.sample(INTERESTS, rng.randint(2, 4))),
+                   x_factor, can_teach, _pick_skills(rng, LEARN_SKILLS, 1, 3), rng.choice(ACCOMMODATION)]
+
+    write("users", user_rows())
+    hashed = hash_password(password)
+    write("passwords", ([email, hashed] for email in emails))
+
+    n_listings = int(users * listings_per_user)
+
+    def listing_rows():
+        for listing_id in range(1, n_listings + 1):
+            listing_type = rng.choice(list(LISTING_TEMPLATES))
+            title, description, price_range = rng.choice(LISTING_TEMPLATES[listing_type])
+            yield [listing_id, rng.randint(1, users), listing_type, title, description,
+                   rng.choice(LOCATIONS), _price(rng, listing_type, price_range),
+                   "available" if rng.random() < 0.85 else "sold"]
+
+    write("listings", listing_rows())
+
+    def connection_rows():
+        for _ in range(int(users * connections_per_user)):
+            user1, user2 = rng.randint(1, users), rng.randint(1, users)
+            if user1 == user2:
+                continue
+            if n_listings and rng.random() < 0.2:
+                connection_type = f"dorm_interest_{rng.randint(1, n_listings)}"
+            else:
+                connection_type = "peer_match"
+            yield [user1, user2, connection_type, _timestamp(rng, start, 180)]
+
+    write("connections", connection_rows())
+
+    def rating_rows():
+        seen = set()
+        for _ in range(int(users * ratings_per_user)):
+            pair = (rng.randint(1, users), rng.randint(1, users))
+            if pair[0] == pair[1] or pair in seen:
+                continue
+            seen.add(pair)
+            score = rng.choices([1, 2, 3, 4, 5], weights=[1, 2, 5, 10, 9])[0]
+            yield [pair[0], pair[1], score, rng.choice(REVIEWS[score]), _timestamp(rng, start, 180)]
+
+    write("ratings", rating_rows())
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic Uni-Sync campus dataset")
+    parser.add_argument("--users", type=int, default=1000, help="number of users (e.g. 1000, 10000, 100000)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="data_synthetic", help="output folder (never the live data/ by default)")
+    parser.add_argument("--listings-per-user", type=float, default=0.3)
+    parser.add_argument("--connections-per-user", type=float, default=3.0)
+    parser.add_argument("--ratings-per-user", type=float, default=2.0)
+    parser.add_argument("--password", default="password123", help="password for every generated account")
+    parser.add_argument("--force", action="store_true", help="overwrite an existing dataset in --out")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(os.path.join(args.out, "users.csv")) and not args.force:
+        parser.error(f"{args.out} already contains a dataset; pass --force to overwrite it")
+
+    counts = generate(args.out, args.users, args.seed, args.listings_per_user,
+                      args.connections_per_user, args.ratings_per_user, args.password)
+    print(", ".join(f"{n} {table}" for table, n in counts.items()) + f" written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+import functools
+import heapq
+import math
+import re
+import threading
+import zlib
+from array import array
+
+import numpy as np
+
+# Cached indexes are shared by every session and patched in place after each write (O(touched entries)),
+# so every public method runs under the index's own lock.
+
+def _locked(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class RatingIndex:  # Per-user rating sum / count / 1-5 star distribution, patched on every upsert
+    def __init__(self, ratings=()):
+        self._lock = threading.RLock()
+        self._pairs = {}  # (rater_id, rated_id) -> current rating
+        self._totals = {}  # rated_id -> (sum, count, (count of 1..5 stars))
+        for r in ratings:
+            self.apply(r['rater_id'], r['rated_id'], r['rating'])
+
+    @_locked
+    def apply(self, rater_id, rated_id, rating):  # Add a rating, replacing the rater's previous one
+        rating = int(rating)
+        total, count, stars = self._totals.get(rated_id, (0, 0, (0,) * 5))
+        stars = list(stars)
+        previous = self._pairs.get((rater_id, rated_id))
+        if previous is not None:
+            total -= previous
+            count -= 1
+            if 1 <= previous <= 5:
+                stars[previous - 1] -= 1
+        self._pairs[(rater_id, rated_id)] = rating
+        total += rating
+        count += 1
+        if 1 <= rating <= 5:
+            stars[rating - 1] += 1
+        self._totals[rated_id] = (total, count, tuple(stars))
+
+    @_locked
+    def summary(self, rated_id):  # (average rounded to 1 decimal, count); (0, 0) when unrated
+        totals = self._totals.get(rated_id)
+        if not totals or not totals[1]:
+            return 0, 0
+        return round(totals[0] / totals[1], 1), totals[1]
+
+    @_locked
+    def distribution(self, rated_id):  # Number of 1..5 star ratings received
+        totals = self._totals.get(rated_id)
+        return list(totals[2]) if totals else [0] * 5
+
+
+class ConnectionIndex:  # Adjacency lists: user_id -> [(peer_id, connection_type, timestamp, row)]
+    def __init__(self, connections=()):
+        self._lock = threading.RLock()
+        self._adjacency = {}
+        for row in connections:
+            self.add(row)
+
+    @_locked
+    def add(self, row):
+        user1, user2 = row['user1_id'], row['user2_id']
+        edge_type, ts = row.get('connection_type'), row.get('timestamp')
+        self._adjacency.setdefault(user1, []).append((user2, edge_type, ts, row))
+        if user2 != user1:
+            self._adjacency.setdefault(user2, []).append((user1, edge_type, ts, row))
+
+    @_locked
+    def rows(self, user_id):  # Connection rows the user takes part in, in insertion order
+        return [edge[3] for edge in self._adjacency.get(user_id, ())]
+
+    @_locked
+    def neighbors(self, user_id, connection_type=None):  # [(peer_id, type, timestamp)], type may end in '*'
+        edges = self._adjacency.get(user_id, ())
+        if connection_type is None:
+            return [edge[:3] for edge in edges]
+        if connection_type.endswith('*'):
+            prefix = connection_type[:-1]
+            return [edge[:3] for edge in edges if str(edge[1]).startswith(prefix)]
+        return [edge[:3] for edge in edges if edge[1] == connection_type]
+
+
+def _email_key(email):
+    return str(email or '').strip().casefold()
+
+
+class UserDirectory:  # Case-folded email -> user / password hash and id -> user lookups
+    def __init__(self, users=(), passwords=()):
+        self._lock = threading.RLock()
+        self._by_id = {}
+        self._by_email = {}
+        self._passwords = {}
+        for user in users:
+            self.add_user(user)
+        for entry in passwords:
+            self.set_password(entry.get('email'), entry.get('password'))
+
+    @_locked
+    def add_user(self, user):
+        self._by_id[user.get('id')] = user
+        self._by_email.setdefault(_email_key(user.get('email')), user)  # First profile wins, like the old linear scan
+
+    @_locked
+    def set_password(self, email, hashed):
+        self._passwords[_email_key(email)] = hashed
+
+    @_locked
+    def by_id(self, user_id):
+        return self._by_id.get(user_id)
+
+    @_locked
+    def by_email(self, email):
+        return self._by_email.get(_email_key(email))
+
+    @_locked
+    def has_email(self, email):
+        return _email_key(email) in self._by_email
+
+    @_locked
+    def has_password(self, email):
+        return _email_key(email) in self._passwords
+
+    @_locked
+    def check_password(self, email, hashed):
+        return self._passwords.get(_email_key(email)) == hashed
+
+
+_WORD = re.compile(r"[a-z0-9+#]+")
+STOP_WORDS = frozenset("""
+a an and any anyone are at be can for find from get give have help i in is it learn looking me my need of on
+or our some someone something study teach the to who with want wants you
+""".split())
+
+
+def search_terms(text):  # Lower-cased words minus stop words, with a plural "s" folded off
+    terms = []
+    for word in _WORD.findall(str(text or '').casefold()):
+        if word in STOP_WORDS:
+            continue
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+class SearchIndex:  # Inverted index: term -> {record id: field weight}, scored with idf at query time
+    def __init__(self, fields, records=()):
+        self.fields = fields  # field name -> weight
+        self._lock = threading.RLock()
+        self._postings = {}
+        self._records = {}
+        for record in records:
+            self.add(record)
+
+    @_locked
+    def add(self, record):
+        record_id = record.get('id')
+        self._records[record_id] = record
+        for field, weight in self.fields.items():
+            for term in set(search_terms(record.get(field))):
+                posting = self._postings.setdefault(term, {})
+                posting[record_id] = posting.get(record_id, 0) + weight
+
+    @_locked
+    def search(self, query, k=10):  # Top-k [(record, score)] sharing at least one term with the query
+        total = len(self._records)
+        scores = {}
+        for term in set(search_terms(query)):
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + total / len(posting))
+            for record_id, weight in posting.items():
+                scores[record_id] = scores.get(record_id, 0) + weight * idf
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(self._records[record_id], round(score, 3)) for record_id, score in best]
+
+
+def _features(term):  # The term plus its character trigrams, so "pythn" still lands near "python"
+    padded = f"<{term}>"
+    return [term] + [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+class VectorIndex:  # Sparse hashed TF-IDF vectors, top-k by cosine similarity
+    def __init__(self, fields, records=(), dims=2 ** 18):
+        self.fields = fields  # field name -> weight
+        self.dims = dims
+        self._lock = threading.RLock()
+        self._ids = []
+        self._records = []
+        self._rows = {}  # record id -> row number
+        self._buckets = {}  # term -> hashed buckets of its features
+        rows, cols, vals = array('i'), array('i'), array('f')  # Compact while collecting
+        for record in records:
+            row = self._rows[record.get('id')] = len(self._ids)
+            self._ids.append(record.get('id'))
+            self._records.append(record)
+            record_cols, record_vals = self._vector(record)
+            rows.extend([row] * len(record_cols))
+            cols.extend(record_cols)
+            vals.extend(record_vals)
+        rows, cols, vals = np.array(rows, dtype=np.int32), np.array(cols, dtype=np.int32), np.array(vals, dtype=np.float32)
+        order = np.argsort(cols, kind='stable')
+        self._set_entries(rows[order], cols[order], vals[order])
+
+    def _set_entries(self, rows, cols, vals):  # Non-zero entries sorted by bucket
+        self._row_of, self._cols, self._vals = rows, cols, vals
+        self._df = np.bincount(cols, minlength=self.dims)  # Rows with a non-zero weight per bucket
+        self._weights = None  # (idf, row norms), recomputed on the first query after an add
+
+    def _term_buckets(self, term):
+        buckets = self._buckets.get(term)
+        if buckets is None:
+            buckets = self._buckets[term] = [zlib.crc32(f.encode()) % self.dims for f in _features(term)]
+        return buckets
+
+    def _vector(self, text_by_field):  # ([bucket], [sublinear tf]) for the indexed fields
+        counts = {}
+        for field, weight in self.fields.items():
+            for term in search_terms(text_by_field.get(field)):
+                for bucket in self._term_buckets(term):
+                    counts[bucket] = counts.get(bucket, 0) + weight
+        return list(counts), [math.sqrt(count) for count in counts.values()]
+
+    @_locked
+    def add(self, record):  # Add or replace a record
+        rows, cols, vals = self._row_of, self._cols, self._vals
+        row = self._rows.get(record.get('id'))
+        if row is None:
+            row = self._rows[record.get('id')] = len(self._ids)
+            self._ids.append(record.get('id'))
+            self._records.append(record)
+        else:
+            self._records[row] = record
+            keep = rows != row
+            rows, cols, vals = rows[keep], cols[keep], vals[keep]
+        record_cols, record_vals = self._vector(record)
+        order = np.argsort(np.array(record_cols, dtype=np.int32))
+        record_cols = np.array(record_cols, dtype=np.int32)[order]
+        at = np.searchsorted(cols, record_cols, side='right')
+        self._set_entries(np.insert(rows, at, row), np.insert(cols, at, record_cols),
+                          np.insert(vals, at, np.array(record_vals, dtype=np.float32)[order]))
+
+    def _idf_and_norms(self):
+        weights = self._weights
+        if weights is None:
+            idf = np.log1p(len(self._ids) / np.maximum(self._df, 1)).astype(np.float32)
+            weighted = self._vals * idf[self._cols]
+            norms = np.sqrt(np.bincount(self._row_of, weighted * weighted, minlength=len(self._ids)))
+            weights = self._weights = (idf, norms)
+        return weights
+
+    def _top(self, cols, vals, k):  # Only the query's buckets are read, via their slice of the sorted entries
+        if not self._ids or not cols:
+            return []
+        idf, norms = self._idf_and_norms()
+        cols = np.array(cols, dtype=np.int32)
+        query = np.array(vals, dtype=np.float32) * idf[cols]
+        query_norm = np.linalg.norm(query)
+        if not query_norm:
+            return []
+        starts = np.searchsorted(self._cols, cols, side='left')
+        ends = np.searchsorted(self._cols, cols, side='right')
+        scores = np.zeros(len(self._ids), dtype=np.float32)
+        for col, weight, start, end in zip(cols, query, starts, ends):
+            if start < end:  # A row appears at most once per bucket
+                scores[self._row_of[start:end]] += self._vals[start:end] * (idf[col] * weight)
+        hits = np.flatnonzero(scores)
+        if not len(hits):
+            return []
+        cosine = scores[hits] / (norms[hits] * query_norm)
+        k = min(k, len(hits))
+        best = sorted(np.argpartition(-cosine, k - 1)[:k], key=lambda i: (-cosine[i], self._ids[hits[i]]))
+        return [(self._records[hits[i]], round(float(cosine[i]), 3)) for i in best]
+
+    @_locked
+    def search(self, query, k=10):  # Top-k [(record, cosine)] for free text, matched against every field
+        return self._top(*self._vector({field: query for field in self.fields}), k)
+
+
+class CompatibilityIndex:  # calculate_compatibility for many pairs at once, from sparse token -> rows postings
+    def __init__(self, users=()):
+        self._lock = threading.RLock()
+        self._load(users)
+
+    def _load(self, users):  # Encode every user from scratch
+        self.users = []  # Row order of every score array
+        self._rows = {}  # user id -> row number
+        self._majors = {}  # major -> code
+        self._major_codes = []
+        self._postings = ({}, {}, {})  # interest token / teach piece / learn piece -> [row]
+        self._encoded = []  # Per row (interests, teach, learn) sets
+        self._arrays = None  # NumPy copies of the above, rebuilt lazily after an add
+        for user in users:
+            self._append(user)
+
+    @staticmethod
+    def _tokens(user):  # (interests, teach, learn) split exactly like calculate_compatibility does
+        interests = set((user.get('interests', '') or '').lower().split(','))
+        teach = {s.strip().lower() for s in user.get('can_teach').split(',')} if user.get('can_teach') else set()
+        learn = {s.strip().lower() for s in user.get('wants_to_learn').split(',')} if user.get('wants_to_learn') else set()
+        return interests, teach, learn
+
+    @_locked
+    def add(self, user):
+        row = self._rows.get(user.get('id'))
+        if row is not None:  # Changed profile: postings can't be patched cheaply, re-encode everyone
+            users = self.users
+            users[row] = user
+            self._load(users)
+            return
+        self._append(user)
+
+    def _append(self, user):
+        self._rows[user.get('id')] = len(self.users)
+        self._major_codes.append(self._majors.setdefault(user.get('major'), len(self._majors)))
+        encoded = self._tokens(user)
+        for postings, tokens in zip(self._postings, encoded):
+            for token in tokens:
+                postings.setdefault(token, []).append(len(self.users))
+        self._encoded.append(encoded)
+        self.users.append(user)
+        self._arrays = None
+
+    def _build(self):
+        if self._arrays is None:
+            majors = np.array(self._major_codes, dtype=np.int32)
+            postings = tuple({token: np.array(rows, dtype=np.int32) for token, rows in p.items()} for p in self._postings)
+            self._arrays = majors, postings
+        return self._arrays
+
+    def _row(self, user, teaching):
+        majors, (interests, teachers, learners) = self._build()
+        user_interests, user_teach, user_learn = self._tokens(user)
+        scores = np.where(majors == self._majors.get(user.get('major'), -1), 30, 0).astype(np.int32)
+        for token in user_interests:
+            rows = interests.get(token)
+            if rows is not None:
+                scores[rows] += 10
+        match = np.zeros(len(scores), dtype=bool)
+        for piece in (user_teach if teaching else user_learn):
+            rows = (learners if teaching else teachers).get(piece)
+            if rows is not None:
+                match[rows] = True
+        scores[match] += 40
+        return np.minimum(scores, 100)
+
+    @_locked
+    def scores_from(self, user):  # [calculate_compatibility(user, other) for other in self.users]
+        return self._row(user, teaching=True)
+
+    @_locked
+    def scores_to(self, user):  # [calculate_compatibility(other, user) for other in self.users]
+        return self._row(user, teaching=False)
+
+    @_locked
+    def matrix(self):  # N x N array, [i, j] == calculate_compatibility(users[i], users[j]); O(N^2) memory
+        majors, (interests, teachers, learners) = self._build()
+        scores = np.where(majors[:, None] == majors[None, :], 30, 0).astype(np.int32)
+        for rows in interests.values():
+            scores[np.ix_(rows, rows)] += 10
+        match = np.zeros(scores.shape, dtype=bool)
+        for piece, rows in teachers.items():
+            learning = learners.get(piece)
+            if learning is not None:
+                match[np.ix_(rows, learning)] = True
+        scores[match] += 40
+        return np.minimum(scores, 100)
+
+    @_locked
+    def recommend(self, user, k=10, exclude=()):  # Top-k [(peer, score)] among users sharing a teach/learn piece with `user`
+        interests, teach, learn = self._tokens(user)
+        teachers, learners = self._postings[1], self._postings[2]
+        candidates = set()
+        for piece in learn:
+            if piece:
+                candidates.update(teachers.get(piece, ()))
+        for piece in teach:
+            if piece:
+                candidates.update(learners.get(piece, ()))
+        skip = set(exclude)
+        skip.add(user.get('id'))
+        major = user.get('major')
+        scored = []
+        for row in candidates:  # Only users reached through the postings are scored
+            peer = self.users[row]
+            if peer.get('id') in skip:
+                continue
+            score = 40 + (30 if peer.get('major') == major else 0) + 10 * len(interests & self._encoded[row][0])
+            scored.append((min(score, 100), row))  # == max(calculate_compatibility) over both directions
+        best = heapq.nlargest(k, scored, key=lambda item: (item[0], -item[1]))
+        return [(self.users[row], score) for score, row in best]
@@ -0,0 +1,137 @@
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+from src import config
+
+ENABLED = config.PROFILE
+
+_history = deque(maxlen=config.PROFILE_HISTORY)  # Finished reruns, newest last
+_totals = {}  # name -> {"count", "total_ms", "max_ms"} across all reruns
+_lock = threading.Lock()
+_local = threading.local()  # Current rerun frame of this script thread
+
+
+def _new_frame(page):
+    return {"page": page, "started": time.time(), "_t0": time.perf_counter(),
+            "calls": {}, "rows_read": 0, "rows_written": 0}
+
+
+def _record(name, elapsed_ms):
+    frame = getattr(_local, "frame", None)
+    if frame is not None:
+        stats = frame["calls"].setdefault(name, {"count": 0, "total_ms": 0.0})
+        stats["count"] += 1
+        stats["total_ms"] += elapsed_ms
+    with _lock:
+        stats = _totals.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["count"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+
+def instrumented(fn=None, name=None):  # Decorator: wall time and call count per function (inclusive of nested calls)
+    if fn is None:
+        return lambda f: instrumented(f, name)
+    if not ENABLED:
+        return fn
+    label = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+    if inspect.isgeneratorfunction(fn):  # Time the whole iteration, not just creating the generator
+        @functools.wraps(fn)
+        def generator_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return (yield from fn(*args, **kwargs))
+            finally:
+                _record(label, (time.perf_counter() - start) * 1000)
+        return generator_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _record(label, (time.perf_counter() - start) * 1000)
+    return wrapper
+
+
+@contextmanager
+def _timed(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, (time.perf_counter() - start) * 1000)
+
+
+def timed(name):  # Context manager variant of @instrumented for a block of page code
+    return _timed(name) if ENABLED else nullcontext()
+
+
+def record_rows(read=0, written=0):  # Called by the storage backends
+    if not ENABLED:
+        return
+    frame = getattr(_local, "frame", None)
+    if frame is not None:
+        frame["rows_read"] += read
+        frame["rows_written"] += written
+
+
+def begin_rerun(page):  # Start timing a Streamlit rerun; closes a frame left open by st.rerun() on this thread
+    if not ENABLED:
+        return
+    if getattr(_local, "frame", None) is not None:
+        end_rerun(complete=False)
+    _local.frame = _new_frame(page)
+
+
+def end_rerun(complete=True):  # Finish the current rerun and push it to the rolling store
+    if not ENABLED:
+        return
+    frame = getattr(_local, "frame", None)
+    if frame is None:
+        return
+    _local.frame = None
+    t0 = frame.pop("_t0")
+    frame["wall_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+    frame["complete"] = complete
+    for stats in frame["calls"].values():
+        stats["total_ms"] = round(stats["total_ms"], 3)
+    with _lock:
+        _history.append(frame)
+    if config.PROFILE_LOG:
+        with _lock, open(config.PROFILE_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps(frame) + "\n")
+
+
+def recent_reruns(limit=None):  # Newest first
+    with _lock:
+        reruns = list(_history)
+    reruns.reverse()
+    return reruns[:limit] if limit else reruns
+
+
+def function_totals():
+    with _lock:
+        return {name: dict(stats) for name, stats in _totals.items()}
+
+
+def export_jsonl(path):  # Write the rolling store as one JSON object per rerun
+    with _lock:
+        reruns = list(_history)
+    with open(path, "w", encoding="utf-8") as f:
+        for frame in reruns:
+            f.write(json.dumps(frame) + "\n")
+    return len(reruns)
+
+
+def reset():
+    with _lock:
+        _history.clear()
+        _totals.clear()
@@ -0,0 +1,132 @@
+import random
+import re
+import threading
+import time
+
+_RETRY_AFTER = re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+)|retry (?:in|after) (\d+(?:\.\d+)?)\s*s", re.IGNORECASE)
+
+
+def is_rate_limit_error(error):  # 429 / RESOURCE_EXHAUSTED / quota messages from the Gemini client
+    text = str(error).lower()
+    return any(marker in text for marker in ("429", "quota", "rate limit", "resource_exhausted", "resource exhausted"))
+
+
+def retry_after(error):  # Seconds the server asked us to wait, None when it did not say
+    match = _RETRY_AFTER.search(str(error))
+    return float(match.group(1) or match.group(2)) if match else None
+
+
+def backoff_delay(attempt, base=0.5, cap=8.0):  # Full-jitter exponential backoff
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def estimate_tokens(text):  # Rough Gemini token count (~4 characters per token)
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:  # `capacity` units refilled evenly over `period` seconds
+    def __init__(self, capacity, period=60.0, clock=time.monotonic):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount):  # Seconds until `amount` units are available (0 when they are now)
+        self._refill()
+        amount = min(amount, self.capacity)  # A request bigger than the bucket waits for a full bucket
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def give_back(self, amount):  # Refund an over-estimate (or charge an under-estimate when negative)
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class KeyState:  # One API key: its buckets, requests in flight and health
+    def __init__(self, index, key, rpm, tpm, clock):
+        self.index = index
+        self.key = key
+        self.requests = TokenBucket(rpm, clock=clock)
+        self.tokens = TokenBucket(tpm, clock=clock)
+        self.in_flight = 0
+        self.failures = 0  # Consecutive rate-limit errors
+        self.cooldown_until = 0.0
+        self.calls = 0
+        self.rate_limited = 0
+
+    def __repr__(self):
+        return f"KeyState(#{self.index}, in_flight={self.in_flight}, failures={self.failures})"
+
+
+class KeyPool:  # Process-wide Gemini key pool: per-key RPM/TPM buckets, cooldown after 429s, least-loaded pick
+    def __init__(self, keys, rpm=15, tpm=250000, cooldown=30.0, max_cooldown=300.0, clock=time.monotonic,
+                 sleep=time.sleep):
+        self.keys = tuple(keys)
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._clock = clock
+        self._sleep = sleep
+        self._states = [KeyState(i, key, rpm, tpm, clock) for i, key in enumerate(self.keys, 1)]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._states)
+
+    def _wait_time(self, state, tokens, now):
+        return max(state.cooldown_until - now, state.requests.wait_time(1), state.tokens.wait_time(tokens))
+
+    def acquire(self, tokens=1, timeout=5.0):  # Reserve the least-loaded healthy key, waiting up to `timeout`; None if none frees up
+        deadline = self._clock() + timeout
+        while True:
+            with self._lock:
+                now = self._clock()
+                waits = [(self._wait_time(s, tokens, now), s.in_flight, -s.requests.tokens, s.index, s)
+                         for s in self._states]
+                if not waits:
+                    return None
+                wait, _, _, _, state = min(waits)
+                if wait <= 0:
+                    state.requests.take(1)
+                    state.tokens.take(tokens)
+                    state.in_flight += 1
+                    state.calls += 1
+                    return state
+            if now + wait > deadline:
+                return None
+            self._sleep(min(wait, deadline - now))
+
+    def release(self, state, tokens_reserved=0, tokens_used=None):  # Request finished; settle the token estimate
+        with self._lock:
+            state.in_flight -= 1
+            if tokens_used is not None:
+                state.tokens.give_back(tokens_reserved - tokens_used)
+            state.failures = 0
+
+    def rate_limited(self, state, delay=None):  # Request hit a 429: cool the key down with jittered exponential growth
+        with self._lock:
+            state.in_flight -= 1
+            state.failures += 1
+            state.rate_limited += 1
+            cooldown = min(self.max_cooldown, self.cooldown * 2 ** (state.failures - 1))
+            cooldown = max(delay or 0, cooldown * random.uniform(0.8, 1.2))
+            state.cooldown_until = self._clock() + cooldown
+
+    def failed(self, state):  # Any other error: free the slot, key stays healthy
+        with self._lock:
+            state.in_flight -= 1
+
+    def stats(self):  # Per-key snapshot for debugging / load tests (keys themselves are not included)
+        now = self._clock()
+        with self._lock:
+            return [{"key": s.index, "in_flight": s.in_flight, "calls": s.calls, "rate_limited": s.rate_limited,
+                     "cooling_down_s": round(max(0.0, s.cooldown_until - now), 2),
+                     "requests_left": round(s.requests.tokens, 2), "tokens_left": round(s.tokens.tokens)}
+                    for s in self._states]
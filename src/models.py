@@ -0,0 +1,132 @@
+import sys
+from collections.abc import Mapping
+
+INT = "int"  # Integer id / score, None when the cell is empty
+TEXT = "text"  # Free text, "" when the cell is empty
+INTERNED = "interned"  # Low-cardinality text (major, year, type...) shared via sys.intern
+TOKENS = "tokens"  # Comma-separated list stored as a tuple of interned pieces
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _to_int(value):
+    if _is_missing(value) or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_text(value):
+    if _is_missing(value):
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+
+def _to_tokens(value):  # Exact round trip: ",".join(pieces) gives back the original string
+    text = _to_text(value)
+    return tuple(sys.intern(piece) for piece in text.split(",")) if text else ()
+
+
+_CONVERT = {
+    INT: _to_int,
+    TEXT: _to_text,
+    INTERNED: lambda value: sys.intern(_to_text(value)),
+    TOKENS: _to_tokens,
+}
+
+
+class Model(Mapping):  # Slotted, read-only row that still behaves like the old dict records
+    __slots__ = ()
+    FIELDS = ()  # (name, kind) pairs in CSV column order
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._kinds = dict(cls.FIELDS)
+        for name, kind in cls.FIELDS:  # Token fields read back as the original comma-separated string
+            if kind == TOKENS:
+                setattr(cls, name, property(lambda self, slot=f"_{name}": ",".join(getattr(self, slot))))
+
+    def __init__(self, **values):
+        for name, kind in self.FIELDS:
+            slot = f"_{name}" if kind == TOKENS else name
+            object.__setattr__(self, slot, _CONVERT[kind](values.get(name)))
+
+    @classmethod
+    def from_row(cls, row):
+        return row if isinstance(row, cls) else cls(**row)
+
+    def __setattr__(self, name, value):
+        raise TypeError(f"{type(self).__name__} records are read-only; copy with dict(record) first")
+
+    def __getitem__(self, key):
+        if key not in self._kinds:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return (name for name, _ in self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __reduce__(self):
+        return (_rebuild, (type(self), dict(self)))
+
+    def tokens(self, name):  # Raw comma-separated pieces of a TOKENS field (not stripped)
+        return getattr(self, f"_{name}")
+
+
+def _rebuild(cls, values):
+    return cls(**values)
+
+
+def _slots(fields):
+    return tuple(f"_{name}" if kind == TOKENS else name for name, kind in fields)
+
+
+class User(Model):
+    FIELDS = (
+        ("id", INT), ("name", TEXT), ("email", TEXT), ("year", INTERNED), ("major", INTERNED),
+        ("skills", TOKENS), ("interests", TOKENS), ("x_factor", TEXT), ("can_teach", TOKENS),
+        ("wants_to_learn", TOKENS), ("accommodation_need", TEXT),
+    )
+    __slots__ = _slots(FIELDS)
+
+
+class Listing(Model):
+    FIELDS = (
+        ("id", INT), ("user_id", INT), ("type", INTERNED), ("title", TEXT), ("description", TEXT),
+        ("location", INTERNED), ("price", INTERNED), ("status", INTERNED),
+    )
+    __slots__ = _slots(FIELDS)
+
+
+class Password(Model):
+    FIELDS = (("email", TEXT), ("password", TEXT))
+    __slots__ = _slots(FIELDS)
+
+
+class Connection(Model):
+    FIELDS = (("user1_id", INT), ("user2_id", INT), ("connection_type", INTERNED), ("timestamp", INTERNED))
+    __slots__ = _slots(FIELDS)
+
+
+class Rating(Model):
+    FIELDS = (("rater_id", INT), ("rated_id", INT), ("rating", INT), ("review", TEXT), ("timestamp", INTERNED))
+    __slots__ = _slots(FIELDS)
+
+
+MODELS = {
+    "users": User,
+    "listings": Listing,
+    "passwords": Password,
+    "connections": Connection,
+    "ratings": Rating,
+}
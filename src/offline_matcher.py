@@ -0,0 +1,132 @@
+import re
+
+from src.data_manager import get_ratings_for, get_users_by_ids, search_listings, search_users
+from src.indexes import search_terms
+from src.utils import calculate_compatibility
+
+LISTING_WORDS = frozenset(search_terms(
+    "room rooms pg flat hostel roommate accommodation rent furniture desk chair table bed mattress bookshelf "
+    "buy sell selling sale cheap price textbook book notes laptop calculator monitor electronics cycle"
+))
+TEACH_PATTERN = re.compile(r"\b(teach(ing|er)?|tutor(ing)?|mentor|lessons?|coach(ing)?|help (me )?with)\b",
+                           re.IGNORECASE)
+STUDY_PATTERN = re.compile(r"\b(study|buddy|partner|group|revise|prepare|course|exam)\b", re.IGNORECASE)
+LEARN_PATTERN = re.compile(r"\blearn(ing)?\b", re.IGNORECASE)  # Weakest cue: also part of subjects like "machine learning"
+GENERIC_WORDS = frozenset(search_terms(
+    "buddy partner group tutor tutoring mentor lesson coach coaching course exam revise prepare learning teaching "
+    "teacher people person student good best recommend"
+))
+FAST_PATH_MAX_TERMS = 3  # Longer questions are left to Gemini when it is available
+
+
+def detect_intent(query):  # 'listing', 'teach', 'study' or None
+    terms = set(search_terms(query))
+    if terms & LISTING_WORDS:
+        return 'listing'
+    if TEACH_PATTERN.search(query):
+        return 'teach'
+    if STUDY_PATTERN.search(query):
+        return 'study'
+    if LEARN_PATTERN.search(query):
+        return 'teach'
+    return None
+
+
+def _matching_pieces(topic, *texts):  # Comma-separated entries (as written) that share a word with the topic
+    pieces = []
+    for text in texts:
+        for piece in str(text or '').split(','):
+            piece = piece.strip()
+            if piece and piece not in pieces and topic & set(search_terms(piece)):
+                pieces.append(piece)
+    return pieces
+
+
+def _rank_teachers(topic, user):  # Students who list a topic word under can_teach
+    ranked = []
+    for candidate, _ in search_users(" ".join(topic), 50):
+        matched = _matching_pieces(topic, candidate.get('can_teach'))
+        if not matched or (user and candidate.get('id') == user.get('id')):
+            continue
+        compatibility = calculate_compatibility(candidate, user) if user else 0
+        ranked.append((len(matched) * 100 + compatibility, candidate, matched))
+    return ranked
+
+
+def _rank_study_partners(topic, user):  # Students learning, knowing or majoring in the topic
+    ranked = []
+    for candidate, _ in search_users(" ".join(topic), 50):
+        if user and candidate.get('id') == user.get('id'):
+            continue
+        matched = _matching_pieces(topic, candidate.get('wants_to_learn'), candidate.get('skills'), candidate.get('major'))
+        if not matched:
+            continue
+        compatibility = calculate_compatibility(user, candidate) if user else 0
+        ranked.append((len(matched) * 100 + compatibility, candidate, matched))
+    return ranked
+
+
+def _format_people(ranked, intent, subject, limit):
+    ranked.sort(key=lambda item: (-item[0], item[1].get('id')))
+    ranked = ranked[:limit]
+    trust = get_ratings_for([candidate.get('id') for _, candidate, _ in ranked])
+    lines = ["🎯 Perfect Matches Found!", ""]
+    for _, candidate, matched in ranked:
+        avg, count = trust.get(candidate.get('id'), (0, 0))
+        skills = ", ".join(matched)
+        if intent == 'teach':
+            reason = f"Can teach {candidate.get('can_teach')}"
+            why = f"Their teaching skills cover {skills}"
+        else:
+            reason = f"Also into {skills}"
+            why = f"Wants to learn {candidate.get('wants_to_learn') or 'new skills'}; skills: {candidate.get('skills')}"
+        if count:
+            why += f" (rated {avg}/5 by {count} students)"
+        lines += [f"👤 {candidate.get('name')} ({candidate.get('major')}) - {reason}",
+                  f"   📧 Contact: {candidate.get('email')}",
+                  f"   💡 Why: {why}", ""]
+    if intent == 'teach':
+        lines.append("📍 Next Steps: Email your top pick to set up a first session, and check their reviews on the Reviews page.")
+    else:
+        lines.append(f"📍 Next Steps: Reach out to plan a study session on {subject or 'your course'}, "
+                     "or swipe through more peers on Find Peers.")
+    return "\n".join(lines)
+
+
+def _listing_answer(query, limit):
+    available = [listing for listing, _ in search_listings(query, 20) if listing.get('status') != 'sold'][:limit]
+    if not available:
+        return None
+    sellers = {u.get('id'): u for u in get_users_by_ids({l.get('user_id') for l in available})}
+    lines = ["🎯 Perfect Matches Found!", ""]
+    for listing in available:
+        seller = sellers.get(listing.get('user_id'))
+        lines += [f"🏷️ {listing.get('title')} ({listing.get('type')}) - {listing.get('price')}",
+                  f"   📍 Location: {listing.get('location')}",
+                  f"   📧 Contact: {seller.get('email') if seller else 'see Dorm Deals'}",
+                  f"   💡 Why: {listing.get('description')}", ""]
+    lines.append("📍 Next Steps: Contact the seller soon, listings go fast. Browse Dorm Deals for more options.")
+    return "\n".join(lines)
+
+
+def offline_answer(query, user=None, limit=3, fast_path=False):  # Local "Perfect Matches Found" answer, None if unsure
+    intent = detect_intent(query)
+    terms = set(search_terms(query))
+    if fast_path and (intent is None or len(terms) > FAST_PATH_MAX_TERMS):
+        return None
+    if intent == 'listing':
+        return _listing_answer(query, limit)
+    topic = terms - GENERIC_WORDS
+    subject = " ".join(w for w in query.split() if topic & set(search_terms(w)))
+    if intent == 'teach' and topic:
+        ranked = _rank_teachers(topic, user)
+    elif intent == 'study' or (intent is None and not fast_path):
+        if not topic and user and not fast_path:  # "find me a study buddy": go by what the asker wants to learn
+            topic = set(search_terms(f"{user.get('wants_to_learn', '')} {user.get('major', '')}"))
+        ranked = _rank_study_partners(topic, user) if topic else []
+        intent = 'study'
+    else:
+        return None
+    if not ranked:
+        return None
+    return _format_people(ranked, intent, subject.strip("?!.,"), limit)
@@ -0,0 +1,68 @@
+from src.data_manager import get_ratings_for
+from src.key_pool import estimate_tokens
+
+LEGEND = "Fields: Maj=major, Yr=year, T=can teach, L=wants to learn, Sk=other skills, E=email, ★=avg rating/5 (ratings)"
+
+
+def _pieces(text):
+    return [piece.strip() for piece in str(text or '').split(',') if piece.strip()]
+
+
+def _dedupe(pieces, seen):  # Drop entries already mentioned (case-insensitive), remembering the rest
+    kept = []
+    for piece in pieces:
+        key = piece.casefold()
+        if key not in seen:
+            seen.add(key)
+            kept.append(piece)
+    return kept
+
+
+def user_line(user, trust):  # Compact one-line student card
+    seen = set()
+    teach = _dedupe(_pieces(user.get('can_teach')), seen)
+    learn = _dedupe(_pieces(user.get('wants_to_learn')), seen)
+    skills = _dedupe(_pieces(user.get('skills')), seen)
+    avg, count = trust
+    fields = [f"• {user.get('name')}", f"Maj:{user.get('major')}", f"Yr:{str(user.get('year')).replace(' Year', '')}"]
+    if teach and teach != ['None yet']:
+        fields.append(f"T:{','.join(teach)}")
+    if learn:
+        fields.append(f"L:{','.join(learn)}")
+    if skills:
+        fields.append(f"Sk:{','.join(skills)}")
+    fields.append(f"E:{user.get('email')}")
+    fields.append(f"★{avg}({count})" if count else "★unrated")
+    return "|".join(fields)
+
+
+def listing_line(listing):
+    return "|".join([f"• {listing.get('title')}", str(listing.get('type')), str(listing.get('price')),
+                     str(listing.get('location')), str(listing.get('description')), str(listing.get('status'))])
+
+
+def _pack(lines, budget):  # Keep lines in rank order while they fit in `budget` tokens
+    packed, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1  # + newline
+        if used + cost > budget:
+            continue  # A shorter, lower-ranked line may still fit
+        packed.append(line)
+        used += cost
+    return packed, used
+
+
+def build_context(users, listings, budget, user_share=0.7):  # Ranked candidates -> (users_str, listings_str, stats)
+    trust = get_ratings_for([u.get('id') for u in users])
+    user_lines = [user_line(u, trust.get(u.get('id'), (0, 0))) for u in users]
+    listing_lines = [listing_line(l) for l in listings]
+    listing_need = sum(estimate_tokens(line) + 1 for line in listing_lines)
+    user_budget = max(int(budget * user_share), budget - listing_need)  # Students may use what listings don't need
+    packed_users, user_tokens = _pack(user_lines, user_budget)
+    packed_listings, listing_tokens = _pack(listing_lines, budget - user_tokens)  # Unused student budget carries over
+    stats = {"context_tokens": user_tokens + listing_tokens, "budget": budget,
+             "users": len(packed_users), "users_retrieved": len(user_lines),
+             "listings": len(packed_listings), "listings_retrieved": len(listing_lines)}
+    users_str = "\n".join(packed_users) or "No students matched this query."
+    listings_str = "\n".join(packed_listings) or "No listings matched this query."
+    return users_str, listings_str, stats
@@ -0,0 +1,316 @@
+import csv
+import io
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from src import config
+from src.instrumentation import record_rows
+
+COLUMNS = {  # Column order of every table (matches the CSV headers)
+    "users": ["id", "name", "email", "year", "major", "skills", "interests", "x_factor",
+              "can_teach", "wants_to_learn", "accommodation_need"],
+    "listings": ["id", "user_id", "type", "title", "description", "location", "price", "status"],
+    "passwords": ["email", "password"],
+    "connections": ["user1_id", "user2_id", "connection_type", "timestamp"],
+    "ratings": ["rater_id", "rated_id", "rating", "review", "timestamp"],
+}
+
+INT_COLUMNS = {"id", "user_id", "user1_id", "user2_id", "rater_id", "rated_id", "rating"}
+ID_TABLES = {"users", "listings"}  # Tables whose rows get a sequential id on insert
+
+
+RATING_KEY = ["rater_id", "rated_id"]
+
+
+def _ends_with_newline(path):
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def _fold_ratings(df):  # Last write wins for each (rater, rated) pair in an append-only log
+    return df.drop_duplicates(RATING_KEY, keep='last')
+
+
+class CSVStorage:  # One CSV file per table, rewritten with pandas on every change
+    def __init__(self, data_dir, append_only=False, compact_every=500):
+        self.data_dir = data_dir
+        self.append_only = append_only  # Append connections/ratings as log records instead of rewriting
+        self.compact_every = compact_every
+        self._append_lock = threading.Lock()
+        self._appended_ratings = 0
+        self._compacting = False
+
+    def path(self, table):
+        return os.path.join(self.data_dir, f"{table}.csv")
+
+    def version(self, table):  # File identity; changes whenever the CSV is rewritten or appended to
+        try:
+            st = os.stat(self.path(table))
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def seed(self, table, rows):  # Write sample rows if the table is missing or empty
+        os.makedirs(self.data_dir, exist_ok=True)
+        path = self.path(table)
+        if rows and (not os.path.exists(path) or os.path.getsize(path) == 0):
+            pd.DataFrame(rows, columns=COLUMNS[table]).to_csv(path, index=False)
+
+    def _read(self, table):
+        path = self.path(table)
+        if os.path.exists(path):
+            df = pd.read_csv(path)
+            record_rows(read=len(df))
+            return _fold_ratings(df) if table == "ratings" and self.append_only else df
+        return pd.DataFrame(columns=COLUMNS[table])
+
+    def load(self, table):
+        try:
+            if os.path.exists(self.path(table)):
+                return self._read(table).to_dict('records')
+        except:
+            pass
+        return []
+
+    def _write(self, table, df):  # Rewrite the whole CSV file
+        df.to_csv(self.path(table), index=False)
+        record_rows(written=len(df))
+
+    def _append(self, table, row):  # Write one CSV record with a single fsync'd write
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator='\n')
+        path = self.path(table)
+        with self._append_lock:
+            if not os.path.exists(path) or os.path.getsize(path) == 0:
+                writer.writerow(COLUMNS[table])
+            elif not _ends_with_newline(path):
+                buf.write('\n')
+            writer.writerow(['' if row.get(c) is None else row.get(c) for c in COLUMNS[table]])
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, buf.getvalue().encode('utf-8'))
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        record_rows(written=1)
+
+    def insert(self, table, row):  # Append a row, assigning an id for users/listings
+        if self.append_only and table == "connections":
+            self._append(table, row)
+            return None
+
+        df = self._read(table)
+        new_id = None
+        if table in ID_TABLES:
+            new_id = len(df) + 1
+            row['id'] = new_id
+        df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
+        self._write(table, df)
+        return new_id
+
+    def set_password(self, email, hashed):
+        if not os.path.exists(self.path("passwords")):
+            return False
+
+        df = self._read("passwords")
+        if email.lower() in df['email'].str.lower().values:
+            df.loc[df['email'].str.lower() == email.lower(), 'password'] = hashed
+            self._write("passwords", df)
+            return True
+        return False
+
+    def upsert_rating(self, row):
+        if self.append_only:
+            self._append("ratings", row)
+            self._appended_ratings += 1
+            if self._appended_ratings >= self.compact_every and not self._compacting:
+                self._compacting = True
+                threading.Thread(target=self.compact_ratings, daemon=True).start()
+            return
+
+        df = self._read("ratings")
+        mask = (df['rater_id'] == row['rater_id']) & (df['rated_id'] == row['rated_id'])
+        if mask.any():
+            df.loc[mask, 'rating'] = row['rating']
+            df.loc[mask, 'review'] = row['review']
+            df.loc[mask, 'timestamp'] = row['timestamp']
+        else:
+            df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
+        self._write("ratings", df)
+
+    def compact_ratings(self):  # Fold the ratings log into one row per (rater, rated) pair
+        path = self.path("ratings")
+        try:
+            with self._append_lock:
+                if not os.path.exists(path):
+                    return
+                snapshot_size = os.path.getsize(path)
+                self._appended_ratings = 0
+            with open(path, 'rb') as f:
+                snapshot = f.read(snapshot_size)
+            folded = _fold_ratings(pd.read_csv(io.BytesIO(snapshot)))
+            tmp_path = path + ".compact"
+            folded.to_csv(tmp_path, index=False)
+            with self._append_lock:  # Carry over records appended while we were folding
+                with open(path, 'rb') as f:
+                    f.seek(snapshot_size)
+                    tail = f.read()
+                with open(tmp_path, 'ab') as f:
+                    f.write(tail)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+        finally:
+            self._compacting = False
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY, name TEXT, email TEXT, year TEXT, major TEXT, skills TEXT,
+    interests TEXT, x_factor TEXT, can_teach TEXT, wants_to_learn TEXT, accommodation_need TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users (email COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS listings (
+    id INTEGER PRIMARY KEY, user_id INTEGER, type TEXT, title TEXT, description TEXT,
+    location TEXT, price TEXT, status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_listings_user ON listings (user_id);
+CREATE TABLE IF NOT EXISTS passwords (
+    email TEXT PRIMARY KEY COLLATE NOCASE, password TEXT
+);
+CREATE TABLE IF NOT EXISTS connections (
+    id INTEGER PRIMARY KEY, user1_id INTEGER, user2_id INTEGER, connection_type TEXT, timestamp TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_connections_user1 ON connections (user1_id);
+CREATE INDEX IF NOT EXISTS idx_connections_user2 ON connections (user2_id);
+CREATE TABLE IF NOT EXISTS ratings (
+    rater_id INTEGER, rated_id INTEGER, rating INTEGER, review TEXT, timestamp TEXT,
+    PRIMARY KEY (rater_id, rated_id)
+);
+CREATE INDEX IF NOT EXISTS idx_ratings_rated ON ratings (rated_id);
+CREATE TABLE IF NOT EXISTS table_versions (
+    name TEXT PRIMARY KEY, version INTEGER NOT NULL
+);
+"""
+
+
+class SQLiteStorage:  # Indexed tables in a single SQLite file, one connection per thread
+    def __init__(self, db_path, data_dir):
+        self.db_path = db_path
+        self.data_dir = data_dir
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _bump(self, conn, table):  # Advance the version counter inside the writing transaction
+        conn.execute(
+            "INSERT INTO table_versions (name, version) VALUES (?, 1) "
+            "ON CONFLICT (name) DO UPDATE SET version = version + 1",
+            (table,)
+        )
+
+    def version(self, table):
+        row = self._conn().execute("SELECT version FROM table_versions WHERE name = ?", (table,)).fetchone()
+        return row[0] if row else 0
+
+    def _insert_many(self, conn, table, rows):
+        self._bump(conn, table)
+        record_rows(written=len(rows))
+        cols = COLUMNS[table]
+        sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+        if table == "passwords":
+            sql += " ON CONFLICT (email) DO UPDATE SET password = excluded.password"
+        elif table == "ratings":  # Keep the original row position when a rating is replaced
+            sql += (" ON CONFLICT (rater_id, rated_id) DO UPDATE SET rating = excluded.rating, "
+                    "review = excluded.review, timestamp = excluded.timestamp")
+        values = [[_sql_value(c, row.get(c)) for c in cols] for row in rows]
+        return conn.execute(sql, values[0]) if len(values) == 1 else conn.executemany(sql, values)
+
+    def seed(self, table, rows):  # Import the existing CSV on first run, else write sample rows
+        conn = self._conn()
+        if conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+            return
+        csv_path = os.path.join(self.data_dir, f"{table}.csv")
+        if os.path.exists(csv_path) and os.path.getsize(csv_path) > 0:
+            with open(csv_path, newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+        with conn:
+            self._insert_many(conn, table, rows)
+
+    def load(self, table):
+        rows = self._conn().execute(f"SELECT {', '.join(COLUMNS[table])} FROM {table} ORDER BY rowid")
+        rows = [dict(r) for r in rows]
+        record_rows(read=len(rows))
+        return rows
+
+    def insert(self, table, row):
+        conn = self._conn()
+        with conn:
+            if table in ID_TABLES:
+                row['id'] = None  # INTEGER PRIMARY KEY: SQLite assigns max(id) + 1 under its write lock
+            cursor = self._insert_many(conn, table, [row])
+            if table in ID_TABLES:
+                row['id'] = cursor.lastrowid
+        return row.get('id') if table in ID_TABLES else None
+
+    def set_password(self, email, hashed):
+        conn = self._conn()
+        with conn:
+            cur = conn.execute("UPDATE passwords SET password = ? WHERE email = ?", (hashed, email))
+            if cur.rowcount:
+                self._bump(conn, "passwords")
+                record_rows(written=cur.rowcount)
+        return cur.rowcount > 0
+
+    def upsert_rating(self, row):
+        conn = self._conn()
+        with conn:
+            self._insert_many(conn, "ratings", [row])
+
+
+def _sql_value(column, value):  # Normalise CSV strings / NaN into SQLite values
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if column in INT_COLUMNS:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    return value
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+def get_storage():  # Return the process-wide backend chosen by UNISYNC_STORAGE
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                if config.STORAGE_BACKEND == "sqlite":
+                    _storage = SQLiteStorage(config.SQLITE_PATH, config.DATA_DIR)
+                elif config.STORAGE_BACKEND == "csv":
+                    _storage = CSVStorage(config.DATA_DIR, config.APPEND_ONLY, config.COMPACT_EVERY)
+                else:
+                    raise ValueError(f"Unknown UNISYNC_STORAGE backend: {config.STORAGE_BACKEND!r}")
+    return _storage
+
+def set_storage(storage):  # Swap the process-wide backend (benchmarks, scripts); returns the previous one
+    global _storage
+    with _storage_lock:
+        previous, _storage = _storage, storage
+    return previous
@@ -1,4 +1,5 @@
 import streamlit as st
+import json
 
 def user_card(user_data):  # Display user profile card
     st.markdown(f"""
@@ -54,4 +55,53 @@ def skill_card(skill_data, type="teach"):  # Display skill card
             <br>
             <small>Contact: {skill_data['learner_email']}</small>
         </div>
-        """, unsafe_allow_html=True)
\ No newline at end of file
+        """, unsafe_allow_html=True)
+
+def page_cursor(key, query_signature):  # Cursor for the page currently shown; resets when filters change
+    state = st.session_state.setdefault(f"{key}_pager", {"signature": None, "cursors": [None]})
+    if state["signature"] != query_signature:
+        state["signature"] = query_signature
+        state["cursors"] = [None]
+    return state["cursors"][-1]
+
+def pager(key, next_cursor):  # Previous / Next buttons driving page_cursor
+    state = st.session_state[f"{key}_pager"]
+    col_prev, col_page, col_next = st.columns([1, 1, 1])
+    with col_prev:
+        if len(state["cursors"]) > 1 and st.button("◀ Previous", key=f"{key}_prev", use_container_width=True):
+            state["cursors"].pop()
+            st.rerun()
+    with col_page:
+        st.caption(f"Page {len(state['cursors'])}")
+    with col_next:
+        if next_cursor and st.button("Next ▶", key=f"{key}_next", use_container_width=True):
+            state["cursors"].append(next_cursor)
+            st.rerun()
+
+def stop_page():  # st.stop() that still records the rerun: the next rerun starts on a new script thread
+    from src.instrumentation import end_rerun
+    end_rerun(complete=False)
+    st.stop()
+
+def debug_panel():  # Hidden profiling panel: set UNISYNC_PROFILE=1 and open the page with ?debug=1
+    from src import instrumentation
+    if not instrumentation.ENABLED or st.query_params.get("debug") != "1":
+        return
+    with st.expander("⏱️ Profiling", expanded=False):
+        reruns = instrumentation.recent_reruns(limit=20)
+        st.markdown("**Recent reruns**")
+        st.dataframe([
+            {"page": r["page"], "wall_ms": r["wall_ms"], "rows_read": r["rows_read"],
+             "rows_written": r["rows_written"], "complete": r["complete"],
+             "slowest": max(r["calls"], key=lambda n: r["calls"][n]["total_ms"], default="")}
+            for r in reruns
+        ], use_container_width=True)
+        st.markdown("**Function totals**")
+        totals = instrumentation.function_totals()
+        st.dataframe(sorted(
+            ({"function": name, "calls": s["count"], "total_ms": round(s["total_ms"], 3),
+              "mean_ms": round(s["total_ms"] / s["count"], 3), "max_ms": round(s["max_ms"], 3)}
+             for name, s in totals.items()),
+            key=lambda row: -row["total_ms"]), use_container_width=True)
+        st.download_button("Export JSONL", "".join(json.dumps(r) + "\n" for r in reversed(reruns)),
+                           file_name="unisync_profile.jsonl", mime="application/json")
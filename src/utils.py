@@ -1,9 +1,15 @@
-def get_user_by_id(user_id, users):  # Find user by ID
+from src.instrumentation import instrumented
+
+def get_user_by_id(user_id, users=None):  # Find user by ID
+    from src.data_manager import get_user_directory, load_users
+    if users is None or users is load_users():  # Shared record set: use the id index
+        return get_user_directory().by_id(user_id)
     for user in users:
         if user.get('id') == user_id:
             return user
     return None
 
+@instrumented
 def calculate_compatibility(user1, user2):  # Calculate compatibility score between two users
     score = 0
     if user1.get('major') == user2.get('major'):
@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add parent directory to path
+os.environ.setdefault("UNISYNC_DATA_DIR", tempfile.mkdtemp(prefix="unisync-tests-"))  # Before src.config is imported
+os.environ.setdefault("UNISYNC_AI_CACHE_PATH", "")
+
+
+@pytest.fixture(scope="session")
+def campus():  # Synthetic users, listings and ratings shared by the data-backed tests
+    from src import config
+    from src.data_manager import init_data, invalidate_cache, load_users
+    from src.datagen import generate
+    generate(config.DATA_DIR, users=300, seed=7)
+    invalidate_cache()
+    init_data()
+    return load_users()
+
+
+@pytest.fixture
+def while_patching():  # run(index, read, patch, n): read(index) in a loop on another thread during n patch(index, i) calls
+    def run(index, read, patch, n):
+        errors, done = [], threading.Event()
+
+        def reader():
+            while not done.is_set():
+                try:
+                    read(index)
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # Switch threads as often as possible so a reader lands mid-patch
+        thread = threading.Thread(target=reader)
+        thread.start()
+        try:
+            for i in range(n):
+                patch(index, i)
+        finally:
+            done.set()
+            thread.join()
+            sys.setswitchinterval(interval)
+        return errors
+    return run
@@ -0,0 +1,35 @@
+import pytest
+
+from src.ai_cache import ResponseCache, normalize_query
+
+
+@pytest.mark.parametrize("first, second", [
+    ("Can anyone teach me Python?", "can someone please teach me python"),
+    ("Who can teach Python?", "who can  teach PYTHON"),
+    ("Hey, any rooms on campus?", "rooms"),
+    ("I want to learn guitar!", "i want learn guitar"),
+])
+def test_equivalent_questions_share_a_key(first, second):
+    assert normalize_query(first) == normalize_query(second)
+
+
+@pytest.mark.parametrize("first, second", [
+    ("I can teach python", "Who can teach Python?"),
+    ("I can teach python", "Can someone teach me python?"),
+    ("Who wants to learn guitar from me?", "Who can teach me guitar?"),
+    ("teach my roommate python", "teach python"),
+])
+def test_direction_of_a_request_is_kept(first, second):
+    assert normalize_query(first) != normalize_query(second)
+
+
+def test_normalize_keeps_a_query_made_only_of_filler_words():
+    assert normalize_query("Can you help?") == "can you help"
+
+
+def test_cache_is_keyed_on_query_direction(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    cache.put("Who can teach Python?", 1, "tutors")
+    assert cache.get("who can teach python", 1) == "tutors"
+    assert cache.get("I can teach python", 1) is None
+    assert cache.get("Who can teach Python?", 2) is None
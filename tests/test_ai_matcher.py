@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from src import ai_matcher, config
+
+
+@pytest.mark.parametrize("query", ["Find me a study buddy", "I need help"])
+def test_vague_questions_are_filled_from_the_askers_profile(campus, query):
+    asker = campus[0]
+    users, listings, from_profile = ai_matcher._retrieve(query, asker)
+    assert from_profile
+    assert len(users) == config.AI_TOP_USERS
+    assert asker['id'] not in [u['id'] for u in users]
+    assert len({u['id'] for u in users}) == len(users)
+    assert len(listings) == config.AI_TOP_LISTINGS
+    assert "Asked by: " + asker['name'] in ai_matcher.build_prompt(query, asker)
+    assert ai_matcher._asker_version(query, "v1", asker) == ("v1", asker['id'])
+
+
+def test_questions_with_enough_matches_stay_shared(campus):
+    query = "Who can teach me Python?"
+    users, _, from_profile = ai_matcher._retrieve(query, campus[0])
+    assert not from_profile
+    assert [u['id'] for u in users] == [u['id'] for u in ai_matcher._retrieve(query)[0]]
+    assert ai_matcher._asker_version(query, "v1", campus[0]) == "v1"
+    assert "Asked by" not in ai_matcher.build_prompt(query, campus[0])
+
+
+class _StubGemini:  # Stands in for _generate: yields "Hello ", waits for release(), then ends with `ending`
+    def __init__(self, ending="world"):
+        self.ending = ending
+        self.calls = 0
+        self._release = threading.Event()
+
+    def __call__(self, prompt, stream=False):
+        self.calls += 1
+        yield "Hello "
+        assert self._release.wait(5)
+        if isinstance(self.ending, Exception):
+            raise self.ending
+        yield self.ending
+
+    def release(self):
+        self._release.set()
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    stub = _StubGemini()
+    monkeypatch.setattr(ai_matcher, "_generate", stub)
+    monkeypatch.setattr(ai_matcher, "build_prompt", lambda query, user=None: query)
+    return stub
+
+
+def _ask_concurrently(query, followers):  # Leader reads its first chunk, then `followers` threads join its flight
+    leader = ai_matcher._coalesced(query, "v1", stream=True)
+    first = next(leader)
+    joined = ai_matcher.FLIGHT_STATS["followers"]
+    results = [None] * followers
+
+    def follow(i):
+        try:
+            results[i] = "".join(ai_matcher._coalesced(query, "v1", stream=True))
+        except ai_matcher.AIUnavailable as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=follow, args=(i,)) for i in range(followers)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while ai_matcher.FLIGHT_STATS["followers"] < joined + followers and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return leader, first, threads, results
+
+
+def test_followers_replay_the_leaders_chunks(gemini):
+    leader, first, threads, results = _ask_concurrently("coalesce replay", 4)
+    gemini.release()
+    assert first + "".join(leader) == "Hello world"
+    for thread in threads:
+        thread.join(5)
+    assert results == ["Hello world"] * 4
+    assert gemini.calls == 1
+    assert not ai_matcher._flights
+
+
+def test_followers_get_the_leaders_ai_unavailable(gemini):
+    gemini.ending = ai_matcher.AIUnavailable("quota gone")
+    leader, _, threads, results = _ask_concurrently("coalesce error", 3)
+    gemini.release()
+    with pytest.raises(ai_matcher.AIUnavailable):
+        list(leader)
+    for thread in threads:
+        thread.join(5)
+    assert [str(error) for error in results] == ["quota gone"] * 3
+    assert gemini.calls == 1
+
+
+def test_closing_the_leader_releases_its_followers(gemini):
+    leader, _, threads, results = _ask_concurrently("coalesce closed", 3)
+    gemini.release()
+    leader.close()  # Streamlit rerun while the leader was streaming
+    for thread in threads:
+        thread.join(5)
+    assert not any(thread.is_alive() for thread in threads)
+    assert all(isinstance(error, ai_matcher.AIUnavailable) and "cut off" in str(error) for error in results)
+    assert not ai_matcher._flights
+
+
+def test_response_text_comes_from_the_first_candidate():
+    glm = ai_matcher.glm
+    parts = [glm.Part(text="Hello "), glm.Part(text="world")]
+    response = glm.GenerateContentResponse(candidates=[glm.Candidate(content=glm.Content(parts=parts))])
+    assert ai_matcher._text(response) == "Hello world"
+    blocked = glm.GenerateContentResponse(candidates=[glm.Candidate(finish_reason=glm.Candidate.FinishReason.SAFETY)])
+    with pytest.raises(ValueError, match="SAFETY"):
+        ai_matcher._text(blocked)
+    assert ai_matcher._request("hi").contents[0].parts[0].text == "hi"
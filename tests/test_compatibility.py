@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from src.indexes import CompatibilityIndex
+from src.utils import calculate_compatibility
+
+EDGE_CASES = [  # Quirks of calculate_compatibility the batch engine must reproduce
+    {'id': 9001, 'major': "CS", 'interests': "", 'can_teach': "a,,b", 'wants_to_learn': ""},
+    {'id': 9002, 'major': "CS", 'interests': "", 'can_teach': "", 'wants_to_learn': " A ,"},
+    {'id': 9003, 'major': "Physics", 'interests': "Music, hiking,music", 'can_teach': "Python", 'wants_to_learn': "x,"},
+    {'id': 9004, 'major': "", 'interests': "MUSIC, Hiking", 'can_teach': " python ", 'wants_to_learn': "Python"},
+    {'id': 9005, 'major': "Physics", 'interests': " hiking", 'can_teach': "None yet", 'wants_to_learn': "python, x"},
+]
+OUTSIDER = {'id': -1, 'major': "CS", 'interests': "music,", 'can_teach': "Python, guitar", 'wants_to_learn': "calculus"}
+
+
+@pytest.fixture(scope="module")
+def users(campus):
+    return list(campus) + EDGE_CASES
+
+
+@pytest.fixture(scope="module")
+def reference(users):
+    return np.array([[calculate_compatibility(a, b) for b in users] for a in users])
+
+
+def test_matrix_matches_calculate_compatibility(users, reference):
+    assert (CompatibilityIndex(users).matrix() == reference).all()
+
+
+def test_rows_match_calculate_compatibility(users, reference):
+    index = CompatibilityIndex(users)
+    for i, user in enumerate(users):
+        assert (index.scores_from(user) == reference[i]).all()
+        assert (index.scores_to(user) == reference[:, i]).all()
+    assert list(index.scores_from(OUTSIDER)) == [calculate_compatibility(OUTSIDER, u) for u in users]
+    assert list(index.scores_to(OUTSIDER)) == [calculate_compatibility(u, OUTSIDER) for u in users]
+
+
+def test_patched_index_matches_a_fresh_build(users):
+    index = CompatibilityIndex(users[:-3])
+    for user in users[-3:]:
+        index.add(user)
+    index.add(dict(users[0], interests="Music"))  # Changed profile
+    rebuilt = CompatibilityIndex([dict(users[0], interests="Music")] + users[1:])
+    assert (index.matrix() == rebuilt.matrix()).all()
+
+
+def test_recommend_scores_only_teach_learn_matches(users):
+    index = CompatibilityIndex(users)
+    for user in users[:40] + [OUTSIDER]:
+        expected = []
+        for row, peer in enumerate(users):
+            _, teach, learn = index._tokens(user)
+            _, peer_teach, peer_learn = index._tokens(peer)
+            if peer.get('id') == user.get('id') or not ({p for p in learn if p} & peer_teach or {p for p in teach if p} & peer_learn):
+                continue
+            score = max(calculate_compatibility(user, peer), calculate_compatibility(peer, user))
+            expected.append((-score, row, peer.get('id'), score))
+        expected = [(peer_id, score) for _, _, peer_id, score in sorted(expected)[:10]]
+        assert [(peer.get('id'), score) for peer, score in index.recommend(user, 10)] == expected
@@ -0,0 +1,46 @@
+from src import data_manager as dm
+
+
+def test_reviews_grouped_is_cached_until_ratings_change(campus):
+    grouped = dm.load_reviews_grouped()
+    assert dm.load_reviews_grouped() is grouped
+    ratings = dm._cached_load("ratings")
+    for rated_id, group in grouped.items():
+        received = [r for r in ratings if r['rated_id'] == rated_id]
+        assert [review['rater_id'] for review in group['reviews']] == [r['rater_id'] for r in received]
+        assert group['review_count'] == len(received)
+        assert group['avg_rating'] == sum(r['rating'] for r in received) / len(received)
+
+    rater, rated = campus[0], campus[1]
+    dm.save_rating(rater['id'], rated['id'], 4, "Helpful")
+    refreshed = dm.load_reviews_grouped()
+    assert refreshed is not grouped
+    review = [r for r in refreshed[rated['id']]['reviews'] if r['rater_id'] == rater['id']][-1]
+    assert (review['rating'], review['review'], review['rater_name']) == (4, "Helpful", rater['name'])
+
+
+def test_query_reviews_pages_match_a_full_sort(campus):
+    grouped = dm.load_reviews_grouped()
+    expected = sorted(((grouped[u['id']]['review_count'], u['id']) for u in campus if u['id'] in grouped), reverse=True)
+    seen, cursor = [], None
+    while True:
+        page, cursor = dm.query_reviews(sort_key='review_count', limit=25, cursor=cursor)
+        assert len(page) <= 25
+        seen += [(entry['review_count'], entry['user']['id']) for entry in page]
+        if cursor is None:
+            break
+    assert seen == expected
+
+
+def test_user_reviews_follow_rating_upserts(campus):
+    rated = campus[2]
+    before = dm.get_user_reviews(rated['id'])
+    assert [r['rater_id'] for r in before] == [r['rater_id'] for r in dm._cached_load("ratings") if r['rated_id'] == rated['id']]
+    newcomer = next(u for u in campus if u['id'] not in {r['rater_id'] for r in before} | {rated['id']})
+    dm.save_rating(newcomer['id'], rated['id'], 2, "Late")
+    dm.save_rating(newcomer['id'], rated['id'], 5, "Changed my mind")
+    after = dm.get_user_reviews(rated['id'])
+    assert [r['rater_id'] for r in after] == [r['rater_id'] for r in before] + [newcomer['id']]
+    assert (after[-1]['rating'], after[-1]['review']) == (5, "Changed my mind")
+    dm.invalidate_cache()
+    assert dm.get_user_reviews(rated['id']) == after
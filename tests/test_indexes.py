@@ -0,0 +1,70 @@
+import pytest
+
+from src.indexes import CompatibilityIndex, ConnectionIndex, RatingIndex, SearchIndex, UserDirectory, VectorIndex
+
+FIELDS = {'can_teach': 3, 'skills': 2}
+
+
+def _user(user_id, teach="Python", skills="Guitar"):
+    return {'id': user_id, 'can_teach': teach, 'skills': skills}
+
+
+def test_search_ranks_by_field_weight():
+    index = SearchIndex(FIELDS, [_user(1, teach="Chess", skills="Python"), _user(2)])
+    assert [record['id'] for record, _ in index.search("python", 2)] == [2, 1]
+
+
+def test_vector_search_tolerates_typos():
+    index = VectorIndex({'can_teach': 1}, [_user(1, teach="Python"), _user(2, teach="Guitar"), _user(3, teach="Chess")])
+    assert [record['id'] for record, _ in index.search("pythn", 3)] == [1]
+
+
+def test_vector_add_and_replace():
+    index = VectorIndex({'can_teach': 1}, [_user(1, teach="Python"), _user(2, teach="Guitar")])
+    assert index.search("origami", 5) == []
+    index.add(_user(3, teach="Origami"))
+    index.add(_user(2, teach="Origami folding"))
+    assert [record['id'] for record, _ in index.search("origami", 5)] == [3, 2]
+    assert index.search("guitar", 5) == []
+    assert index.search("python", 5)[0][1] == 1.0
+
+
+def _profile(user_id):
+    return {'id': user_id, 'email': f"u{user_id}@campus.edu", 'major': ("CS", "Physics", "Design")[user_id % 3],
+            'interests': "Music,hiking", 'can_teach': "Python, Guitar", 'wants_to_learn': "Chess", 'skills': "Guitar"}
+
+
+PATCHED_WHILE_READ = {  # index -> (build, read, patch(index, i), patches, size after the patches)
+    'search': (lambda: SearchIndex(FIELDS, [_user(i) for i in range(2000)]),
+               lambda index: index.search("python guitar", 10),
+               lambda index, i: index.add(_user(2000 + i)), 4000,
+               lambda index: len(index.search("python", 10000)) == 6000),
+    'vector': (lambda: VectorIndex(FIELDS, [_user(i) for i in range(2000)]),
+               lambda index: index.search("python guitar", 10),
+               lambda index, i: index.add(_user(2000 + i, teach="Rust")), 300,
+               lambda index: len(index.search("rust", 1000)) == 300),
+    'compatibility': (lambda: CompatibilityIndex([_profile(i) for i in range(2000)]),
+                      lambda index: (index.scores_to(_profile(0)), index.recommend(_profile(0), 10)),
+                      lambda index, i: index.add(_profile(2000 + i)), 500,
+                      lambda index: len(index.scores_to(_profile(0))) == 2500),
+    'connections': (lambda: ConnectionIndex({'user1_id': i % 50, 'user2_id': i} for i in range(2000)),
+                    lambda index: index.neighbors(7, 'peer*'),
+                    lambda index, i: index.add({'user1_id': 7, 'user2_id': i, 'connection_type': 'peer_match'}), 4000,
+                    lambda index: len(index.neighbors(7, 'peer*')) == 4000),
+    'ratings': (lambda: RatingIndex({'rater_id': i, 'rated_id': i % 50, 'rating': 3} for i in range(2000)),
+                lambda index: (index.summary(7), index.distribution(7)),
+                lambda index, i: index.apply(i, 7, 5), 4000,
+                lambda index: index.summary(7)[1] == 4000),
+    'directory': (lambda: UserDirectory([_profile(i) for i in range(2000)]),
+                  lambda index: index.by_email("u7@campus.edu"),
+                  lambda index, i: index.add_user(_profile(2000 + i)), 4000,
+                  lambda index: index.has_email("u5999@campus.edu")),
+}
+
+
+@pytest.mark.parametrize("name", PATCHED_WHILE_READ)
+def test_reads_while_patches_are_applied(name, while_patching):  # Other sessions read while a save_* patches the shared index
+    build, read, patch, patches, patched = PATCHED_WHILE_READ[name]
+    index = build()
+    assert not while_patching(index, read, patch, patches)
+    assert patched(index)
@@ -0,0 +1,90 @@
+import pytest
+
+from src import key_pool
+from src.key_pool import KeyPool, TokenBucket
+
+
+class FakeClock:  # Manual time: sleep() just moves the clock forward
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(key_pool.random, "uniform", lambda low, high: 1.0)
+
+
+def _pool(clock, keys=("a", "b"), **kwargs):
+    return KeyPool(keys, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_bucket_refills_evenly_up_to_capacity(clock):
+    bucket = TokenBucket(60, period=60.0, clock=clock)
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    clock.now += 30
+    assert bucket.wait_time(30) == 0
+    assert bucket.wait_time(31) == pytest.approx(1.0)
+    clock.now += 600
+    bucket.take(0)
+    assert bucket.tokens == 60
+    assert bucket.wait_time(500) == 0  # Oversized requests wait for a full bucket, not forever
+
+
+def test_acquire_picks_the_least_loaded_key(clock):
+    pool = _pool(clock, keys=("a", "b", "c"))
+    first, second, third = pool.acquire(), pool.acquire(), pool.acquire()
+    assert [first.key, second.key, third.key] == ["a", "b", "c"]
+    pool.release(first)
+    again = pool.acquire()
+    assert again.key == "a"  # The only idle key
+    for state in (again, second, third):
+        pool.release(state)
+    assert pool.acquire().key == "b"  # All idle: "a" has used more of its requests this minute
+
+
+def test_rate_limits_double_the_cooldown_up_to_the_cap(clock):
+    pool = _pool(clock, keys=("a",), cooldown=30.0, max_cooldown=100.0)
+    cooldowns = []
+    for _ in range(4):
+        state = pool.acquire(timeout=1000)
+        pool.rate_limited(state)
+        cooldowns.append(state.cooldown_until - clock.now)
+    assert cooldowns == [30.0, 60.0, 100.0, 100.0]
+    pool.release(pool.acquire(timeout=1000))
+    assert pool._states[0].failures == 0
+
+
+def test_retry_after_is_honoured_when_longer(clock):
+    pool = _pool(clock, keys=("a",), cooldown=30.0)
+    state = pool.acquire()
+    pool.rate_limited(state, key_pool.retry_after("429 Quota exceeded. retry_delay { seconds: 45 }"))
+    assert state.cooldown_until == clock.now + 45
+    assert pool.acquire(timeout=44) is None
+    assert pool.acquire(timeout=45).key == "a"
+    assert clock.now == pytest.approx(1045.0)
+
+
+def test_acquire_gives_up_at_the_deadline(clock):
+    pool = _pool(clock, keys=("a",), rpm=2)
+    pool.acquire()
+    pool.acquire()
+    start = clock.now
+    assert pool.acquire(timeout=10) is None  # Next request slot opens in 30 s
+    assert clock.now == start
+    assert pool.acquire(timeout=30).key == "a"
+    assert clock.now == pytest.approx(start + 30)
+    assert _pool(clock, keys=()).acquire() is None
@@ -0,0 +1,48 @@
+import pytest
+
+from src.offline_matcher import detect_intent, offline_answer
+
+
+@pytest.mark.parametrize("query, intent", [
+    ("I need a study buddy for machine learning", 'study'),
+    ("Find someone to study calculus with", 'study'),
+    ("Looking for a group to revise for the physics exam", 'study'),
+    ("Who can teach me Python?", 'teach'),
+    ("Can someone teach me machine learning?", 'teach'),
+    ("I want to learn guitar", 'teach'),
+    ("Find me a Figma design tutor", 'teach'),
+    ("Any rooms near campus?", 'listing'),
+    ("Looking for a cheap study desk", 'listing'),
+    ("Selling my scientific calculator", 'listing'),
+    ("Want to buy a second-hand laptop", 'listing'),
+    ("What's the weather like?", None),
+])
+def test_detect_intent(query, intent):
+    assert detect_intent(query) == intent
+
+
+def test_study_buddy_for_machine_learning_finds_students(campus):
+    answer = offline_answer("I need a study buddy for machine learning", campus[0], fast_path=True)
+    assert answer is not None and answer.startswith("🎯 Perfect Matches Found!")
+    assert "Machine Learning" in answer
+
+
+def test_teach_query_lists_teachers_of_the_topic(campus):
+    answer = offline_answer("Who can teach me Python?", campus[0], fast_path=True)
+    assert answer is not None and "Can teach" in answer and "Python" in answer
+
+
+def test_listing_query_lists_available_items_only(campus):
+    from src.data_manager import load_listings
+    sold = {l.get('title') + l.get('location') for l in load_listings() if l.get('status') == 'sold'}
+    answer = offline_answer("Any cheap desk for sale?", campus[0])
+    assert answer is not None and "🏷️ Study Desk" in answer
+    for block in answer.split("🏷️ ")[1:]:
+        title = block.split(" (")[0]
+        location = block.split("📍 Location: ")[1].split("\n")[0]
+        assert title + location not in sold
+
+
+def test_fast_path_leaves_long_questions_to_gemini(campus):
+    assert offline_answer("I want to get better at public speaking before placements, who could mentor me?",
+                          campus[0], fast_path=True) is None
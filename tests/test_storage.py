@@ -0,0 +1,27 @@
+import os
+import threading
+
+from src.storage import SQLiteStorage
+
+
+def test_concurrent_sqlite_signups_get_distinct_ids(tmp_path):
+    storage = SQLiteStorage(os.path.join(tmp_path, "unisync.db"), str(tmp_path))
+    ids, errors = [], []
+
+    def signup(worker):
+        try:
+            for i in range(25):
+                row = {'id': 1, 'name': f"User {worker}-{i}", 'email': f"u{worker}-{i}@campus.edu"}
+                ids.append(storage.insert("users", row))
+                assert row['id'] == ids[-1]
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=signup, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert sorted(ids) == list(range(1, 201))
+    assert sorted(r['id'] for r in storage.load("users")) == sorted(ids)